@@ -13,19 +13,39 @@ Funcionalidades:
 - Notificações via Telegram
 """
 
+import hashlib
 import json
-import time
+import logging
 import sys
 import os
-import unicodedata
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Importa módulos do bot
-from processar_email import EmailProcessor
+from processar_email import BuscaNomes, EmailProcessor, normalizar_nome
 from processar_llm import LLMProcessor
 from trello_manager import TrelloManager
 from telegram_bot import TelegramNotifier
+from sessao_http import criar_sessao
+
+
+logger = logging.getLogger('bot')
+
+
+def configurar_log():
+    """
+    Saída do bot via logging (só a mensagem, como antes).
+    Os módulos usam loggers filhos ('bot.email'), que propagam para este handler.
+    """
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 
 class ListaEspecial:
@@ -42,141 +62,223 @@ class ListaEspecial:
                     nome = linha.strip()
                     if nome and not nome.startswith('#'):
                         self.nomes.append(self._normalizar(nome))
-            print(f"   ✅ Lista especial carregada: {len(self.nomes)} nomes")
+            logger.info(f"   ✅ Lista especial carregada: {len(self.nomes)} nomes")
         else:
-            print(f"   ⚠️ Arquivo {arquivo} não encontrado (lista especial vazia)")
+            logger.warning(f"   ⚠️ Arquivo {arquivo} não encontrado (lista especial vazia)")
+        
+        self._busca = BuscaNomes(self.nomes)
     
     def _normalizar(self, texto):
         """Remove acentos e converte para maiúsculas"""
-        texto = texto.upper()
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = ''.join(ch for ch in texto if not unicodedata.combining(ch))
-        return texto
+        return normalizar_nome(texto)
     
     def verificar(self, texto_publicacao):
         """Verifica se algum nome da lista está na publicação"""
-        texto_norm = self._normalizar(texto_publicacao)
-        
-        for nome in self.nomes:
-            if nome in texto_norm:
-                return True, nome
+        # Lista vazia (arquivo ausente): nem normaliza o texto
+        if not self.nomes:
+            return False, None
         
+        nome = self._busca.buscar(self._normalizar(texto_publicacao))
+        if nome:
+            return True, nome
         return False, None
 
 
 class BotPublicacoes:
     def __init__(self, config_path='config.json'):
         """Inicializa o bot com as configurações"""
-        print("🤖 Iniciando Bot de Publicações (Versão 3.0)...")
-        print("="*60)
+        logger.info("🤖 Iniciando Bot de Publicações (Versão 3.0)...")
+        logger.info("="*60)
         
         # Carrega configurações
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
         
         # Inicializa componentes
-        print("\n📧 Conectando ao email...")
+        logger.info("\n📧 Conectando ao email...")
         self.email_processor = EmailProcessor(self.config['email'])
         
         # Detecta provedor de IA
         ia_config = self.config.get('ia', {})
         provedor = ia_config.get('provedor', 'ollama')
-        print(f"\n🧠 Conectando à IA ({provedor.upper()})...")
+        logger.info(f"\n🧠 Conectando à IA ({provedor.upper()})...")
         self.llm_processor = LLMProcessor(ia_config)
         
-        print("\n📋 Conectando ao Trello...")
-        self.trello_manager = TrelloManager(self.config['trello'])
+        # Conexões HTTP reaproveitadas por Trello e Telegram durante toda a execução
+        self.http = criar_sessao(tentativas=2)
+        
+        logger.info("\n📋 Conectando ao Trello...")
+        self.trello_manager = TrelloManager(self.config['trello'], session=self.http)
         
-        print("\n📱 Configurando Telegram...")
-        self.telegram = TelegramNotifier(self.config['telegram'])
+        logger.info("\n📱 Configurando Telegram...")
+        self.telegram = TelegramNotifier(self.config['telegram'], session=self.http)
         
         # Carrega lista especial
-        print("\n📋 Carregando lista especial...")
+        logger.info("\n📋 Carregando lista especial...")
         self.lista_especial = ListaEspecial(self.config.get('lista_especial', {}))
         
-        print("\n" + "="*60)
-        print("✅ Bot inicializado com sucesso!")
-        print(f"   🧠 Provedor de IA: {self.llm_processor.get_provedor_info()}")
-        print("="*60 + "\n")
+        logger.info("\n" + "="*60)
+        logger.info("✅ Bot inicializado com sucesso!")
+        logger.info(f"   🧠 Provedor de IA: {self.llm_processor.get_provedor_info()}")
+        logger.info("="*60 + "\n")
         
         # Controle de emails processados
         self.emails_processados = set()
         
+        # Publicações que já viraram card (sobrevive a reconexões e reexecuções,
+        # já que os IDs IMAP não são estáveis entre sessões)
+        self.arquivo_hashes = self.config['processamento'].get('arquivo_hashes', 'processed_hashes.json')
+        # Hashes mais antigos que isso são descartados (o email já saiu da busca há muito tempo)
+        self.dias_hashes = self.config['processamento'].get('dias_hashes', 90)
+        self.hashes_processados = self._carregar_hashes()
+        
         # Contadores
         self.ignorados_lista_especial = 0
+        self.duplicadas = 0
+    
+    def _carregar_hashes(self):
+        """Carrega os hashes das publicações já processadas ({hash: timestamp})"""
+        try:
+            with open(self.arquivo_hashes, 'r', encoding='utf-8') as f:
+                hashes = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Erro ao ler {self.arquivo_hashes}: {e}")
+            return {}
+        
+        # Formato antigo (lista de hashes): conta a validade a partir de agora
+        if isinstance(hashes, list):
+            agora = time.time()
+            hashes = {h: agora for h in hashes}
+        return self._podar_hashes(hashes)
+    
+    def _podar_hashes(self, hashes):
+        """Remove os hashes com mais de dias_hashes"""
+        limite = time.time() - self.dias_hashes * 24 * 60 * 60
+        return {h: ts for h, ts in hashes.items() if ts >= limite}
+    
+    def _salvar_hashes(self):
+        """Grava os hashes de forma atômica (arquivo temporário + os.replace)"""
+        self.hashes_processados = self._podar_hashes(self.hashes_processados)
+        temporario = f"{self.arquivo_hashes}.tmp"
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.hashes_processados, f)
+            os.replace(temporario, self.arquivo_hashes)
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao gravar {self.arquivo_hashes}: {e}")
+    
+    def _hash_publicacao(self, corpo):
+        """SHA-256 do corpo com espaços normalizados"""
+        return hashlib.sha256(' '.join(corpo.split()).encode('utf-8')).hexdigest()
+    
+    def _analisar_publicacao(self, pub_data):
+        """
+        Etapa que pode rodar em paralelo: lista especial + extração com IA.
+        Retorna (situação, valor):
+          ('lista_especial', nome encontrado) | ('duplicada', None) | ('analisada', dados)
+        """
+        esta_na_lista, nome_encontrado = self.lista_especial.verificar(pub_data['corpo'])
+        if esta_na_lista:
+            return 'lista_especial', nome_encontrado
+        
+        if self._hash_publicacao(pub_data['corpo']) in self.hashes_processados:
+            return 'duplicada', None
+        
+        return 'analisada', self.llm_processor.extrair_dados(pub_data['corpo'])
     
-    def processar_publicacao(self, pub_data):
-        """Processa uma única publicação"""
+    def processar_publicacao(self, pub_data, analise=None):
+        """
+        Processa uma única publicação.
+        analise: Future de _analisar_publicacao já disparado (senão analisa aqui)
+        """
         try:
             numero_pub = pub_data.get('numero_publicacao', 1)
             total_pub = pub_data.get('total_publicacoes', 1)
             
-            print(f"\n{'─'*50}")
-            print(f"📄 Processando publicação {numero_pub}/{total_pub}...")
-            print(f"{'─'*50}")
+            logger.info(f"\n{'─'*50}")
+            logger.info(f"📄 Processando publicação {numero_pub}/{total_pub}...")
+            logger.info(f"{'─'*50}")
             
-            # VERIFICAÇÃO DA LISTA ESPECIAL
-            esta_na_lista, nome_encontrado = self.lista_especial.verificar(pub_data['corpo'])
+            # VERIFICAÇÃO DA LISTA ESPECIAL + 1. Extrai dados com IA
+            if analise is None:
+                situacao, valor = self._analisar_publicacao(pub_data)
+            else:
+                situacao, valor = analise.result()
             
-            if esta_na_lista:
-                print(f"⏭️ IGNORANDO - Cliente na lista especial: {nome_encontrado}")
+            if situacao == 'lista_especial':
+                logger.info(f"⏭️ IGNORANDO - Cliente na lista especial: {valor}")
                 self.ignorados_lista_especial += 1
                 # Ainda marca o email como processado
                 self.emails_processados.add(pub_data['id'])
                 return True  # Retorna True pois foi processado (ignorado intencionalmente)
             
-            # 1. Extrai dados com IA
-            print(f"🧠 Analisando com IA ({self.llm_processor.get_provedor_info()})...")
-            dados_extraidos = self.llm_processor.extrair_dados(pub_data['corpo'])
+            if situacao == 'duplicada':
+                logger.info("⏭️ IGNORANDO - Publicação já processada anteriormente (card já existe)")
+                self.duplicadas += 1
+                self.emails_processados.add(pub_data['id'])
+                return True
             
+            # Mesma publicação repetida neste lote: a análise rodou antes do primeiro card existir
+            hash_publicacao = self._hash_publicacao(pub_data['corpo'])
+            if hash_publicacao in self.hashes_processados:
+                logger.info("⏭️ IGNORANDO - Publicação repetida (card já criado neste ciclo)")
+                self.duplicadas += 1
+                self.emails_processados.add(pub_data['id'])
+                return True
+            
+            dados_extraidos = valor
             if not dados_extraidos:
-                print("❌ Erro ao processar com IA")
+                logger.error("❌ Erro ao processar com IA")
                 return False
             
             # Mostra dados extraídos
-            print(f"✅ Dados extraídos:")
-            print(f"   • Processo: {dados_extraidos.get('numero_processo') or 'N/A'}")
+            logger.info(f"✅ Dados extraídos:")
+            logger.info(f"   • Processo: {dados_extraidos.get('numero_processo') or 'N/A'}")
             cliente = dados_extraidos.get('cliente') or 'N/A'
-            print(f"   • Cliente: {str(cliente)[:40]}...")
-            print(f"   • Tipo: {dados_extraidos.get('tipo_ato') or 'N/A'}")
-            print(f"   • Prazo (PF): {dados_extraidos.get('prazo_calculado') or 'N/A'}")
-            print(f"   • Confiança: {int(dados_extraidos.get('confianca', 0) * 100)}%")
+            logger.info(f"   • Cliente: {str(cliente)[:40]}...")
+            logger.info(f"   • Tipo: {dados_extraidos.get('tipo_ato') or 'N/A'}")
+            logger.info(f"   • Prazo (PF): {dados_extraidos.get('prazo_calculado') or 'N/A'}")
+            logger.info(f"   • Confiança: {int(dados_extraidos.get('confianca', 0) * 100)}%")
             
             # 2. Cria card no Trello
-            print("\n📋 Criando card no Trello...")
+            logger.info("\n📋 Criando card no Trello...")
             card = self.trello_manager.criar_card(dados_extraidos, pub_data)
             
             if card:
-                print(f"✅ Card criado: {card['titulo'][:60]}...")
-                print(f"   🔗 {card['url']}")
+                logger.info(f"✅ Card criado: {card['titulo'][:60]}...")
+                logger.info(f"   🔗 {card['url']}")
                 
-                # 3. Notifica no Telegram
-                print("\n📱 Enviando notificação...")
+                # 3. Notifica no Telegram (envio em segundo plano)
                 if self.telegram.notificar_processamento(dados_extraidos, card['url']):
-                    print("✅ Notificação enviada!")
+                    logger.info("📱 Notificação na fila de envio")
                 else:
-                    print("⚠️ Notificação não enviada")
+                    logger.warning("⚠️ Notificação não enviada")
                 
                 self.emails_processados.add(pub_data['id'])
+                # Gravado a cada card: se o ciclo cair no meio, os emails ainda
+                # não marcados como lidos não geram cards repetidos
+                self.hashes_processados[hash_publicacao] = time.time()
+                self._salvar_hashes()
                 return True
             else:
-                print("❌ Erro ao criar card")
+                logger.error("❌ Erro ao criar card")
                 return False
                 
         except Exception as e:
-            print(f"❌ Erro ao processar publicação: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Erro ao processar publicação: {e}")
             return False
     
     def executar_uma_vez(self):
         """Processa todos os emails pendentes uma vez"""
-        print("\n" + "="*60)
-        print("🔍 VERIFICANDO EMAILS NOVOS...")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("🔍 VERIFICANDO EMAILS NOVOS...")
+        logger.info("="*60)
         
         # Reset contadores
         self.ignorados_lista_especial = 0
+        self.duplicadas = 0
         
         # Busca emails
         publicacoes = self.email_processor.buscar_emails_novos(
@@ -184,114 +286,126 @@ class BotPublicacoes:
         )
         
         if not publicacoes:
-            print("\n📭 Nenhuma publicação nova encontrada.")
+            logger.info("\n📭 Nenhuma publicação nova encontrada.")
             return
         
-        print(f"\n📬 {len(publicacoes)} publicação(ões) encontrada(s)!")
+        logger.info(f"\n📬 {len(publicacoes)} publicação(ões) encontrada(s)!")
         
         # Processa cada publicação
         sucesso = 0
         falhas = 0
         
-        for i, pub_data in enumerate(publicacoes, 1):
-            print(f"\n{'='*60}")
-            print(f"Processando {i}/{len(publicacoes)}")
-            print(f"{'='*60}")
-            
-            if self.processar_publicacao(pub_data):
-                sucesso += 1
-            else:
-                falhas += 1
+        # A IA analisa as publicações em paralelo; cards e notificações
+        # continuam sendo criados em ordem (mais antiga primeiro)
+        paralelismo = self.config['processamento'].get('paralelismo', 4)
+        
+        with ThreadPoolExecutor(max_workers=paralelismo) as executor:
+            analises = [executor.submit(self._analisar_publicacao, p) for p in publicacoes]
             
-            if i < len(publicacoes):
-                print("\n⏳ Aguardando 3 segundos...")
-                time.sleep(3)
+            for i, (pub_data, analise) in enumerate(zip(publicacoes, analises), 1):
+                logger.info(f"\n{'='*60}")
+                logger.info(f"Processando {i}/{len(publicacoes)}")
+                logger.info(f"{'='*60}")
+                
+                if self.processar_publicacao(pub_data, analise):
+                    sucesso += 1
+                else:
+                    falhas += 1
         
         # Marca emails como lidos
         if self.config['email'].get('marcar_como_lido_apos_processar', True):
-            print(f"\n📧 Marcando {len(self.emails_processados)} email(s) como lido(s)...")
-            for email_id in self.emails_processados:
-                try:
-                    self.email_processor.marcar_email_como_lido(email_id)
-                except Exception as e:
-                    print(f"⚠️ Erro ao marcar email {email_id}: {e}")
+            logger.info(f"\n📧 Marcando {len(self.emails_processados)} email(s) como lido(s)...")
+            self.email_processor.marcar_emails_como_lidos(self.emails_processados)
             self.emails_processados.clear()
         
         # Resumo final
-        cards_criados = sucesso - self.ignorados_lista_especial
+        cards_criados = sucesso - self.ignorados_lista_especial - self.duplicadas
         
-        print(f"\n{'='*60}")
-        print(f"📊 RESUMO DO PROCESSAMENTO")
-        print(f"{'='*60}")
-        print(f"📬 Total de publicações: {len(publicacoes)}")
-        print(f"✅ Processados com sucesso: {sucesso}")
-        print(f"   ├─ 📋 Cards criados: {cards_criados}")
-        print(f"   └─ ⏭️ Ignorados (lista especial): {self.ignorados_lista_especial}")
-        print(f"❌ Falhas: {falhas}")
-        print(f"{'='*60}\n")
+        logger.info(f"\n{'='*60}")
+        logger.info(f"📊 RESUMO DO PROCESSAMENTO")
+        logger.info(f"{'='*60}")
+        logger.info(f"📬 Total de publicações: {len(publicacoes)}")
+        logger.info(f"✅ Processados com sucesso: {sucesso}")
+        logger.info(f"   ├─ 📋 Cards criados: {cards_criados}")
+        logger.info(f"   ├─ ⏭️ Ignorados (lista especial): {self.ignorados_lista_especial}")
+        logger.info(f"   └─ ♻️ Já processadas antes: {self.duplicadas}")
+        logger.log(logging.ERROR if falhas else logging.INFO, f"❌ Falhas: {falhas}")
+        logger.info(f"{'='*60}\n")
         
         # Envia resumo no Telegram
-        self.telegram.enviar_resumo_diario(sucesso, falhas, self.ignorados_lista_especial)
+        self.telegram.enviar_resumo_diario(
+            sucesso, falhas, self.ignorados_lista_especial, self.duplicadas
+        )
+        
+        # Só termina a execução depois de criar as checklists e entregar as notificações pendentes
+        self.trello_manager.aguardar_checklists()
+        self.telegram.aguardar_envios()
     
     def executar_continuo(self):
         """Executa continuamente"""
         intervalo = self.config['processamento'].get('intervalo_minutos', 15)
         
-        print(f"\n{'='*60}")
-        print(f"🔄 MODO CONTÍNUO ATIVADO")
-        print(f"{'='*60}")
-        print(f"⏱️  Intervalo: {intervalo} minutos")
-        print(f"⌨️  Pressione Ctrl+C para parar")
-        print(f"{'='*60}\n")
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🔄 MODO CONTÍNUO ATIVADO")
+        logger.info(f"{'='*60}")
+        logger.info(f"⏱️  Intervalo: {intervalo} minutos")
+        logger.info(f"⌨️  Pressione Ctrl+C para parar")
+        logger.info(f"{'='*60}\n")
         
         try:
             while True:
                 hora_atual = datetime.now().strftime("%H:%M:%S")
-                print(f"\n⏰ [{hora_atual}] Iniciando verificação...")
+                logger.info(f"\n⏰ [{hora_atual}] Iniciando verificação...")
                 
                 try:
                     self.executar_uma_vez()
                 except Exception as e:
-                    print(f"❌ Erro durante execução: {e}")
+                    logger.error(f"❌ Erro durante execução: {e}")
                     self.telegram.notificar_erro(e)
                 
                 from datetime import timedelta
                 proxima = datetime.now() + timedelta(minutes=intervalo)
                 
-                print(f"\n💤 Aguardando {intervalo} minutos...")
-                print(f"    Próxima verificação: {proxima.strftime('%H:%M:%S')}")
+                logger.info(f"\n💤 Aguardando novos emails (até {intervalo} minutos)...")
+                logger.info(f"    Próxima verificação: até {proxima.strftime('%H:%M:%S')}")
                 
-                time.sleep(intervalo * 60)
+                # IMAP IDLE: acorda assim que chegar email novo na label
+                if self.email_processor.aguardar_novos_emails(intervalo * 60):
+                    logger.info("📨 Novo email recebido!")
                 
         except KeyboardInterrupt:
-            print("\n\n⛔ Bot interrompido pelo usuário.")
-            print("👋 Até logo!\n")
+            self.trello_manager.close()
+            self.telegram.close()
+            self.http.close()
+            self.llm_processor.close()
+            logger.info("\n\n⛔ Bot interrompido pelo usuário.")
+            logger.info("👋 Até logo!\n")
 
 
 def main():
     """Função principal"""
-    print("\n" + "="*60)
-    print("🤖 BOT DE PUBLICAÇÕES JURÍDICAS")
-    print("    Versão 3.0")
-    print("="*60 + "\n")
+    configurar_log()
+    
+    logger.info("\n" + "="*60)
+    logger.info("🤖 BOT DE PUBLICAÇÕES JURÍDICAS")
+    logger.info("    Versão 3.0")
+    logger.info("="*60 + "\n")
     
     if not Path('config.json').exists():
-        print("❌ Arquivo config.json não encontrado!")
-        print("\nCampos necessários:")
-        print("  - email: servidor, porta, usuario, senha, label")
-        print("  - ia: provedor ('ollama' ou 'gemini'), ollama, gemini")
-        print("  - trello: api_key, token, board_id, lista_id")
-        print("  - telegram: token, chat_id")
-        print("  - lista_especial: arquivo")
+        logger.error("❌ Arquivo config.json não encontrado!")
+        logger.info("\nCampos necessários:")
+        logger.info("  - email: servidor, porta, usuario, senha, label")
+        logger.info("  - ia: provedor ('ollama' ou 'gemini'), ollama, gemini")
+        logger.info("  - trello: api_key, token, board_id, lista_id")
+        logger.info("  - telegram: token, chat_id")
+        logger.info("  - lista_especial: arquivo")
         input("\nPressione ENTER para sair...")
         sys.exit(1)
     
     try:
         bot = BotPublicacoes()
     except Exception as e:
-        print(f"❌ Erro ao inicializar bot: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Erro ao inicializar bot: {e}")
         input("\nPressione ENTER para sair...")
         sys.exit(1)
     
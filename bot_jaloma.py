@@ -7,15 +7,15 @@ Mantem o bot antigo intacto e remove o uso de Telegram nesta versao.
 """
 
 import json
+import logging
 import os
 import sys
 import time
-import unicodedata
 from datetime import datetime
 from pathlib import Path
 
 from jaloma_manager import JalomaManager
-from processar_email import EmailProcessor
+from processar_email import BuscaNomes, EmailProcessor, normalizar_nome
 from processar_llm import LLMProcessor
 
 
@@ -35,16 +35,18 @@ class ListaEspecial:
         else:
             print(f"   Aviso: arquivo {arquivo} nao encontrado (lista especial vazia)")
 
+        self._busca = BuscaNomes(self.nomes)
+
     def _normalizar(self, texto):
-        texto = texto.upper()
-        texto = unicodedata.normalize("NFKD", texto)
-        return "".join(ch for ch in texto if not unicodedata.combining(ch))
+        return normalizar_nome(texto)
 
     def verificar(self, texto_publicacao):
-        texto_norm = self._normalizar(texto_publicacao)
-        for nome in self.nomes:
-            if nome in texto_norm:
-                return True, nome
+        if not self.nomes:
+            return False, None
+
+        nome = self._busca.buscar(self._normalizar(texto_publicacao))
+        if nome:
+            return True, nome
         return False, None
 
 
@@ -77,7 +79,7 @@ class BotPublicacoesJaloma:
         self.emails_processados = set()
         self.ignorados_lista_especial = 0
 
-    def processar_publicacao(self, pub_data):
+    def processar_publicacao(self, pub_data, dados_extraidos=None, verificacao=None):
         try:
             numero_pub = pub_data.get("numero_publicacao", 1)
             total_pub = pub_data.get("total_publicacoes", 1)
@@ -86,7 +88,10 @@ class BotPublicacoesJaloma:
             print(f"Processando publicacao {numero_pub}/{total_pub}...")
             print(f"{'-' * 50}")
 
-            esta_na_lista, nome_encontrado = self.lista_especial.verificar(pub_data["corpo"])
+            # verificacao: resultado da lista especial ja calculado em executar_uma_vez
+            if verificacao is None:
+                verificacao = self.lista_especial.verificar(pub_data["corpo"])
+            esta_na_lista, nome_encontrado = verificacao
             if esta_na_lista:
                 detalhe = f"IGNORADO | lista especial | {nome_encontrado}"
                 print(detalhe)
@@ -94,8 +99,8 @@ class BotPublicacoesJaloma:
                 self.emails_processados.add(pub_data["id"])
                 return {"status": "ignorado", "detalhe": detalhe}
 
-            print(f"Analisando com IA ({self.llm_processor.get_provedor_info()})...")
-            dados_extraidos = self.llm_processor.extrair_dados(pub_data["corpo"])
+            if dados_extraidos is None:
+                dados_extraidos = self.llm_processor.extrair_dados(pub_data["corpo"])
             if not dados_extraidos:
                 return {"status": "falha", "erro": "IA nao retornou dados validos"}
 
@@ -128,11 +133,7 @@ class BotPublicacoesJaloma:
             return
 
         print(f"\nMarcando {len(self.emails_processados)} email(s) como lido(s)...")
-        for email_id in self.emails_processados:
-            try:
-                self.email_processor.marcar_email_como_lido(email_id)
-            except Exception as exc:
-                print(f"Aviso: erro ao marcar email {email_id}: {exc}")
+        self.email_processor.marcar_emails_como_lidos(self.emails_processados)
         self.emails_processados.clear()
 
     def executar_uma_vez(self):
@@ -151,6 +152,19 @@ class BotPublicacoesJaloma:
 
         print(f"\n{len(publicacoes)} publicacao(oes) encontrada(s).")
 
+        # A IA analisa em paralelo as publicacoes fora da lista especial;
+        # os cards continuam sendo criados em ordem
+        verificacoes = [self.lista_especial.verificar(pub_data["corpo"]) for pub_data in publicacoes]
+        indices = [
+            indice for indice, (esta_na_lista, _) in enumerate(verificacoes, 1)
+            if not esta_na_lista
+        ]
+        print(f"Analisando {len(indices)} publicacao(oes) com IA ({self.llm_processor.get_provedor_info()})...")
+        extracoes = dict(zip(
+            indices,
+            self.llm_processor.extrair_dados_lote([publicacoes[indice - 1]["corpo"] for indice in indices]),
+        ))
+
         criados = 0
         existentes = 0
         falhas = 0
@@ -162,7 +176,7 @@ class BotPublicacoesJaloma:
             print(f"Processando {indice}/{len(publicacoes)}")
             print(f"{'=' * 60}")
 
-            resultado = self.processar_publicacao(pub_data)
+            resultado = self.processar_publicacao(pub_data, extracoes.get(indice), verificacoes[indice - 1])
             status = resultado["status"]
 
             if status == "criado":
@@ -230,15 +244,19 @@ class BotPublicacoesJaloma:
                     print(f"Erro durante execucao: {exc}")
 
                 proxima = datetime.now().timestamp() + (intervalo * 60)
-                print(f"Aguardando {intervalo} minuto(s)...")
-                print(f"Proxima verificacao em: {datetime.fromtimestamp(proxima).strftime('%H:%M:%S')}")
-                time.sleep(intervalo * 60)
+                print(f"Aguardando novos emails (ate {intervalo} minuto(s))...")
+                print(f"Proxima verificacao ate: {datetime.fromtimestamp(proxima).strftime('%H:%M:%S')}")
+                if self.email_processor.aguardar_novos_emails(intervalo * 60):
+                    print("Novo email recebido.")
         except KeyboardInterrupt:
             print("\n\nBot interrompido pelo usuario.")
             print("Ate logo.\n")
 
 
 def main():
+    # Mensagens do EmailProcessor (logger 'bot.email') saem junto com as do bot
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("\n" + "=" * 60)
     print("BOT DE PUBLICACOES JURIDICAS - MODO JALOMA")
     print("Versao 1.0")
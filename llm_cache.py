@@ -0,0 +1,64 @@
+"""
+Cache em disco das extrações feitas pela IA
+Evita chamar a IA novamente para publicações já analisadas
+(reexecuções, retentativas e a mesma publicação vinda em mais de um email)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+# Incrementar quando o formato das extrações mudar (invalida entradas antigas)
+VERSAO_CACHE = 'v2'
+
+
+class LLMCache:
+    def __init__(self, diretorio='data/llm_cache', ttl_dias=7):
+        """Inicializa cache em disco (uma entrada JSON por publicação)"""
+        self.diretorio = Path(diretorio)
+        self.ttl_segundos = ttl_dias * 24 * 60 * 60
+
+    @staticmethod
+    def gerar_chave(*campos):
+        """SHA-256 dos campos, cada um prefixado pelo tamanho (evita colisões)"""
+        hash_chave = hashlib.sha256()
+        for campo in campos:
+            dados = str(campo).encode('utf-8')
+            hash_chave.update(str(len(dados)).encode() + b':' + dados)
+        return hash_chave.hexdigest()
+
+    def _caminho(self, chave):
+        """Distribui as entradas em subpastas pelos 2 primeiros caracteres"""
+        return self.diretorio / chave[:2] / f"{chave}.json"
+
+    def get(self, chave):
+        """Retorna o valor em cache, ou None se ausente/expirado"""
+        caminho = self._caminho(chave)
+        try:
+            if time.time() - caminho.stat().st_mtime > self.ttl_segundos:
+                return None
+            with open(caminho, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, chave, valor):
+        """Grava o valor de forma atômica (arquivo temporário + os.replace)"""
+        caminho = self._caminho(chave)
+        temporario = None
+        try:
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(valor, f, ensure_ascii=False)
+            os.replace(temporario, caminho)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Erro ao gravar cache da IA: {e}")
+            if temporario and os.path.exists(temporario):
+                os.remove(temporario)
+            return False
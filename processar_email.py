@@ -6,13 +6,158 @@ Versão Opus - Corrigida e otimizada
 
 import imaplib
 import email
+import functools
+import logging
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
 from datetime import datetime, timedelta
 import re
 import html as html_module
+import select
+import ssl
+import time
 import unicodedata
 
+try:
+    from selectolax.lexbor import LexborHTMLParser  # Opcional: parser HTML5 em C
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import ahocorasick  # Opcional: busca de todos os nomes em uma única passada
+except ImportError:
+    ahocorasick = None
+
+
+logger = logging.getLogger('bot.email')
+
+# Quantidade de emails buscados por comando FETCH / marcados por comando STORE
+TAMANHO_LOTE_FETCH = 100
+TAMANHO_LOTE_STORE = 500
+
+# Servidores encerram IDLE ocioso após ~29 minutos (RFC 2177): renova antes disso
+IDLE_MAXIMO_SEGUNDOS = 25 * 60
+# Espera máxima pelas respostas de início/fim do IDLE
+TIMEOUT_RESPOSTA_IDLE = 30
+
+# Padrões compilados uma única vez (reutilizados em todos os emails)
+# <br> e fechamento de blocos (</p>, </div>, </tr>, </li>) viram quebras de linha
+_RE_BLOCO = re.compile(r'<\s*br\s*/?\s*>|</\s*(p|div|tr|li)\s*>', re.IGNORECASE)
+_QUEBRAS_BLOCO = {None: '\n', 'p': '\n\n', 'div': '\n', 'tr': '\n', 'li': '\n'}
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_WS_INLINE = re.compile(r'[ \t]+')
+_RE_WS_VERTICAL = re.compile(r'\n\s*\n\s*\n+')
+_RE_CNJ = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+_RE_PROCESSO = re.compile(r'PROCESSO\s*[N°:\d]', re.IGNORECASE)
+
+# Padrão ESPECÍFICO: "Publicação: N." no INÍCIO de linha ou após quebra
+# Isso evita pegar "Data de Publicação:" que aparece dentro de cada publicação
+# O padrão correto é: Publicação: 1. / Publicação: 2. etc (com ponto após número)
+_RE_PUB = re.compile(
+    r'(?:^|\n)\s*publica(?:c[aã]o|gao)\s*:\s*(\d+)\s*\.',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+# Marcas combinantes (acentos separados pelo NFKD), removidas via str.translate
+_TABELA_COMBINANTES = {
+    codigo: None
+    for inicio, fim in (
+        (0x0300, 0x0370), (0x1AB0, 0x1B00), (0x1DC0, 0x1E00),
+        (0x20D0, 0x2100), (0xFE20, 0xFE30),
+    )
+    for codigo in range(inicio, fim)
+}
+
+
+def _substituir_bloco(match):
+    """Mapeia a tag de bloco encontrada para a quebra de linha correspondente"""
+    tag = match.group(1)
+    return _QUEBRAS_BLOCO[tag.lower() if tag else None]
+
+
+def _delimitar_blocos(matches, fim_texto):
+    """Gera (match, fim do bloco): o bloco vai até o próximo match ou o fim do texto"""
+    anterior = None
+    for match in matches:
+        if anterior is not None:
+            yield anterior, match.start()
+        anterior = match
+    if anterior is not None:
+        yield anterior, fim_texto
+
+
+def remover_acentos(texto):
+    """Remove acentos (diacríticos) preservando maiúsculas/minúsculas"""
+    # Caminho rápido: texto ASCII não tem o que decompor
+    if texto.isascii():
+        return texto
+    # Texto já decomposto (NFKD) dispensa a normalização; só remove as marcas
+    if not unicodedata.is_normalized('NFKD', texto):
+        texto = unicodedata.normalize('NFKD', texto)
+    return texto.translate(_TABELA_COMBINANTES)
+
+
+@functools.lru_cache(maxsize=128)
+def normalizar_nome(texto):
+    """
+    Maiúsculas sem acentos (comparação com a lista especial).
+    Em cache: a mesma publicação volta a ser verificada em retentativas e
+    emails repetidos (tamanho limitado, só publicações individuais)
+    """
+    return remover_acentos(texto.upper())
+
+
+class BuscaNomes:
+    """
+    Procura vários nomes (já normalizados) num texto em uma única passada:
+    autômato Aho-Corasick se pyahocorasick estiver instalado, senão uma regex
+    com todos os nomes. Usada pela lista especial dos dois bots.
+    """
+    
+    def __init__(self, nomes):
+        self.nomes = list(nomes)
+        self._automato = self._montar_automato()
+        self._regex = self._montar_regex() if self._automato is None else None
+        # Texto mais curto que o menor nome não pode conter nenhum deles
+        self._menor_nome = min(map(len, self.nomes), default=0)
+    
+    def _montar_automato(self):
+        """Monta autômato Aho-Corasick com os nomes (se pyahocorasick estiver instalado)"""
+        if ahocorasick is None or not self.nomes:
+            return None
+        
+        automato = ahocorasick.Automaton()
+        for nome in self.nomes:
+            automato.add_word(nome, nome)
+        automato.make_automaton()
+        return automato
+    
+    def _montar_regex(self):
+        """Sem pyahocorasick: uma única regex com todos os nomes (mais longos primeiro)"""
+        if not self.nomes:
+            return None
+        
+        nomes = sorted(self.nomes, key=len, reverse=True)
+        return re.compile('|'.join(re.escape(nome) for nome in nomes))
+    
+    def buscar(self, texto_norm):
+        """Primeiro nome encontrado no texto normalizado, ou None"""
+        if len(texto_norm) < self._menor_nome:
+            return None
+        
+        if self._automato is not None:
+            for _, nome in self._automato.iter(texto_norm):
+                return nome
+            return None
+        
+        if self._regex is not None:
+            match = self._regex.search(texto_norm)
+            if match:
+                return match.group(0)
+        
+        return None
+
 
 class EmailProcessor:
     def __init__(self, config):
@@ -25,6 +170,7 @@ class EmailProcessor:
         self.marcar_como_lido = config.get('marcar_como_lido_apos_processar', False)
         
         self.mail = None
+        self._contador_idle = 0
         self._conectar()
     
     def _conectar(self):
@@ -34,9 +180,20 @@ class EmailProcessor:
             self.mail.login(self.usuario, self.senha)
             return True
         except Exception as e:
-            print(f"❌ Erro ao conectar ao email: {e}")
+            logger.error(f"❌ Erro ao conectar ao email: {e}")
             raise
     
+    def _garantir_conexao(self):
+        """Mantém uma única sessão IMAP; reconecta apenas se ela caiu"""
+        if self.mail is not None:
+            try:
+                status, _ = self.mail.noop()
+                if status == 'OK':
+                    return
+            except Exception:
+                pass
+        self._conectar()
+    
     def _selecionar_label(self):
         """Seleciona a label/pasta correta no Gmail"""
         if self.label:
@@ -53,20 +210,20 @@ class EmailProcessor:
                 try:
                     status, _ = self.mail.select(formato)
                     if status == 'OK':
-                        print(f"   ✅ Label selecionada: {formato}")
+                        logger.info(f"   ✅ Label selecionada: {formato}")
                         return True
                 except:
                     continue
             
             # Se não encontrou, lista labels disponíveis para debug
-            print(f"   ⚠️ Label '{self.label}' não encontrada. Labels disponíveis:")
+            logger.warning(f"   ⚠️ Label '{self.label}' não encontrada. Labels disponíveis:")
             status, labels = self.mail.list()
             if status == 'OK':
                 for label in labels[:10]:  # Mostra primeiras 10
-                    print(f"      - {label.decode()}")
+                    logger.info(f"      - {label.decode()}")
             
             # Fallback para INBOX
-            print(f"   ℹ️ Usando INBOX como fallback")
+            logger.info(f"   ℹ️ Usando INBOX como fallback")
             self.mail.select('INBOX')
             return False
         else:
@@ -76,9 +233,8 @@ class EmailProcessor:
     def buscar_emails_novos(self, dias=7):
         """Busca emails não lidos na label configurada"""
         try:
-            # Reconecta se necessário
-            if not self.mail or self.mail.state != 'SELECTED':
-                self._conectar()
+            # Reaproveita a sessão aberta (reconecta só se caiu)
+            self._garantir_conexao()
             
             # Seleciona a label
             self._selecionar_label()
@@ -87,7 +243,7 @@ class EmailProcessor:
             status, messages = self.mail.search(None, 'UNSEEN')
             
             if status != 'OK':
-                print("❌ Erro ao buscar emails")
+                logger.error("❌ Erro ao buscar emails")
                 return []
             
             email_ids = messages[0].split()
@@ -95,14 +251,16 @@ class EmailProcessor:
             if not email_ids:
                 return []
             
-            print(f"   📬 {len(email_ids)} email(s) não lido(s) encontrado(s)")
+            logger.info(f"   📬 {len(email_ids)} email(s) não lido(s) encontrado(s)")
             
             # Processa cada email
             emails_agrupados = []
             
+            conteudos = self._buscar_conteudos(email_ids)
+            
             for ordem_email, email_id in enumerate(email_ids):
                 try:
-                    email_data = self._processar_email(email_id)
+                    email_data = self._processar_email(email_id, conteudos.get(email_id))
                     if email_data:
                         data_email = self._parse_email_date(email_data.get('data'))
                         sequencia_email = self._parse_email_sequence(email_id)
@@ -138,7 +296,7 @@ class EmailProcessor:
                             })
                              
                 except Exception as e:
-                    print(f"⚠️ Erro ao processar email {email_id}: {e}")
+                    logger.warning(f"⚠️ Erro ao processar email {email_id}: {e}")
                     continue
 
             # Ordena por data do email (mais antigo primeiro).
@@ -161,7 +319,7 @@ class EmailProcessor:
             return emails_processados
              
         except Exception as e:
-            print(f"❌ Erro ao buscar emails: {e}")
+            logger.error(f"❌ Erro ao buscar emails: {e}")
             return []
 
     def _parse_email_date(self, date_header):
@@ -186,17 +344,43 @@ class EmailProcessor:
         except Exception:
             return None
     
-    def _processar_email(self, email_id):
-        """Processa um email individual"""
-        try:
-            # Busca email (sem marcar como lido ainda)
-            status, msg_data = self.mail.fetch(email_id, '(BODY.PEEK[])')
+    def _buscar_conteudos(self, email_ids):
+        """
+        Busca o conteúdo bruto dos emails em lotes (um FETCH por lote).
+        Retorna dicionário {id IMAP: bytes do email}.
+        """
+        conteudos = {}
+        
+        for inicio in range(0, len(email_ids), TAMANHO_LOTE_FETCH):
+            lote = email_ids[inicio:inicio + TAMANHO_LOTE_FETCH]
+            
+            try:
+                # Busca emails (sem marcar como lido ainda)
+                status, resposta = self.mail.fetch(b','.join(lote), '(BODY.PEEK[])')
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao buscar lote de emails: {e}")
+                continue
             
             if status != 'OK':
+                continue
+            
+            # Resposta intercala tuplas (b'N (BODY[] {tam}', conteudo) com b')'
+            for item in resposta:
+                if not isinstance(item, tuple):
+                    continue
+                cabecalho, conteudo = item
+                conteudos[cabecalho.split(None, 1)[0]] = conteudo
+        
+        return conteudos
+    
+    def _processar_email(self, email_id, conteudo):
+        """Processa um email individual a partir do conteúdo bruto"""
+        try:
+            if conteudo is None:
                 return None
             
             # Parse do email
-            msg = email.message_from_bytes(msg_data[0][1])
+            msg = email.message_from_bytes(conteudo)
             
             # Extrai dados
             assunto = self._decodificar_header(msg['Subject'])
@@ -215,7 +399,7 @@ class EmailProcessor:
             }
             
         except Exception as e:
-            print(f"❌ Erro ao processar email: {e}")
+            logger.error(f"❌ Erro ao processar email: {e}")
             return None
     
     def _decodificar_header(self, header):
@@ -243,22 +427,16 @@ class EmailProcessor:
         corpo_html = ""
         
         if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                
-                try:
-                    payload = part.get_payload(decode=True)
-                    if payload is None:
+            # Prioriza texto puro: só decodifica o HTML se não houver text/plain útil
+            for tipo, converter in (('text/plain', self._limpar_texto),
+                                    ('text/html', self._html_para_texto)):
+                for part in msg.walk():
+                    if part.get_content_type() != tipo:
                         continue
-                    charset = part.get_content_charset() or 'utf-8'
-                    texto = payload.decode(charset, errors='ignore')
-                    
-                    if content_type == 'text/plain':
-                        corpo_texto = texto
-                    elif content_type == 'text/html':
-                        corpo_html = texto
-                except:
-                    continue
+                    texto = self._decodificar_parte(part)
+                    if texto.strip():
+                        return converter(texto)
+            return ""
         else:
             try:
                 payload = msg.get_payload(decode=True)
@@ -282,38 +460,58 @@ class EmailProcessor:
         else:
             return ""
     
+    def _decodificar_parte(self, part):
+        """Decodifica o conteúdo de uma parte MIME ('' se vazia ou inválida)"""
+        try:
+            payload = part.get_payload(decode=True)
+            if payload is None:
+                return ""
+            charset = part.get_content_charset() or 'utf-8'
+            return payload.decode(charset, errors='ignore')
+        except Exception:
+            return ""
+    
     def _html_para_texto(self, html_content):
         """Converte HTML para texto limpo"""
         if not html_content:
             return ""
         
-        # Desescapa entidades HTML
-        texto = html_module.unescape(html_content)
-        
-        # Converte <br> e </p> para quebras de linha
-        texto = re.sub(r'<\s*br\s*/?\s*>', '\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*p\s*>', '\n\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*div\s*>', '\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*tr\s*>', '\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*li\s*>', '\n', texto, flags=re.IGNORECASE)
-        
-        # Remove todas as tags HTML
-        texto = re.sub(r'<[^>]+>', ' ', texto)
+        if LexborHTMLParser is not None:
+            texto = self._html_para_texto_parser(html_content)
+        else:
+            # Desescapa entidades HTML
+            texto = html_module.unescape(html_content)
+            
+            # Converte <br> e </p> para quebras de linha (uma única passada)
+            texto = _RE_BLOCO.sub(_substituir_bloco, texto)
+            
+            # Remove todas as tags HTML
+            texto = _RE_TAG.sub(' ', texto)
         
         # Limpa espaços extras
-        texto = re.sub(r'[ \t]+', ' ', texto)
-        texto = re.sub(r'\n\s*\n\s*\n+', '\n\n', texto)
+        texto = _RE_WS_INLINE.sub(' ', texto)
+        texto = _RE_WS_VERTICAL.sub('\n\n', texto)
         
         return texto.strip()
     
+    def _html_para_texto_parser(self, html_content):
+        """Extrai o texto do HTML com o parser do selectolax (ignora script/style)"""
+        # Quebras de linha entram como texto antes do parse, que as preserva
+        arvore = LexborHTMLParser(_RE_BLOCO.sub(_substituir_bloco, html_content))
+        arvore.strip_tags(['script', 'style'])
+        
+        if arvore.body is None:
+            return ""
+        return arvore.body.text(separator=' ')
+    
     def _limpar_texto(self, texto):
         """Limpa texto de caracteres estranhos e espaços extras"""
         if not texto:
             return ""
         
         # Remove espaços extras
-        texto = re.sub(r'[ \t]+', ' ', texto)
-        texto = re.sub(r'\n\s*\n\s*\n+', '\n\n', texto)
+        texto = _RE_WS_INLINE.sub(' ', texto)
+        texto = _RE_WS_VERTICAL.sub('\n\n', texto)
         
         return texto.strip()
     
@@ -325,74 +523,58 @@ class EmailProcessor:
         if not texto_email:
             return []
         
-        # Normaliza o texto para busca (remove acentos para matching)
-        def remover_acentos(s):
-            return ''.join(
-                ch for ch in unicodedata.normalize('NFKD', s) 
-                if not unicodedata.combining(ch)
-            )
+        # Sem número CNJ nem "PROCESSO" não há publicação a separar:
+        # evita normalizar emails que não são publicações
+        primeiro_cnj = _RE_CNJ.search(texto_email)
+        if not primeiro_cnj and not _RE_PROCESSO.search(texto_email):
+            return []
         
+        # Normaliza o texto para busca (remove acentos para matching)
         texto_norm = remover_acentos(texto_email.lower())
         texto_original = texto_email  # Guarda original para extração
         
         publicacoes = []
         
-        # Padrão ESPECÍFICO: "Publicação: N." no INÍCIO de linha ou após quebra
-        # Isso evita pegar "Data de Publicação:" que aparece dentro de cada publicação
-        # O padrão correto é: Publicação: 1. / Publicação: 2. etc (com ponto após número)
-        pub_regex = re.compile(
-            r'(?:^|\n)\s*publica(?:c[aã]o|gao)\s*:\s*(\d+)\s*\.',
-            re.IGNORECASE | re.MULTILINE
-        )
+        blocos = _delimitar_blocos(_RE_PUB.finditer(texto_norm), len(texto_original))
         
-        matches = list(pub_regex.finditer(texto_norm))
+        for match, end in blocos:
+            numero = int(match.group(1))
+            
+            # Pega desde o INÍCIO do marcador
+            start = match.start()
+            
+            # Extrai bloco do texto ORIGINAL (não normalizado)
+            bloco = texto_original[start:end].strip()
+            
+            # Remove possível \n do início
+            bloco = bloco.lstrip('\n').strip()
+            
+            # Valida se tem conteúdo relevante (número CNJ ou PROCESSO)
+            tem_cnj = _RE_CNJ.search(bloco)
+            tem_processo = _RE_PROCESSO.search(bloco)
+            
+            if bloco and (tem_cnj or tem_processo):
+                publicacoes.append({
+                    'numero': numero,
+                    'texto': bloco
+                })
         
-        if matches:
-            for i, match in enumerate(matches):
-                numero = int(match.group(1))
-                
-                # Pega desde o INÍCIO do marcador
-                start = match.start()
-                end = matches[i + 1].start() if i + 1 < len(matches) else len(texto_original)
-                
-                # Extrai bloco do texto ORIGINAL (não normalizado)
-                bloco = texto_original[start:end].strip()
-                
-                # Remove possível \n do início
-                bloco = bloco.lstrip('\n').strip()
-                
-                # Valida se tem conteúdo relevante (número CNJ ou PROCESSO)
-                tem_cnj = re.search(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}', bloco)
-                tem_processo = re.search(r'PROCESSO\s*[N°:\d]', bloco, re.IGNORECASE)
+        # Padrão 2 (fallback): Separa por número CNJ se não encontrou publicações
+        if not publicacoes and primeiro_cnj:
+            blocos = _delimitar_blocos(_RE_CNJ.finditer(texto_email), len(texto_email))
+            
+            for i, (match, end) in enumerate(blocos, 1):
+                bloco = texto_email[match.start():end].strip()
                 
-                if bloco and (tem_cnj or tem_processo):
+                if len(bloco) > 50:
                     publicacoes.append({
-                        'numero': numero,
+                        'numero': i,
                         'texto': bloco
                     })
         
-        # Padrão 2 (fallback): Separa por número CNJ se não encontrou publicações
-        if not publicacoes:
-            cnj_regex = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
-            cnj_matches = list(cnj_regex.finditer(texto_email))
-            
-            if len(cnj_matches) >= 1:
-                for i, match in enumerate(cnj_matches):
-                    start = match.start()
-                    end = cnj_matches[i + 1].start() if i + 1 < len(cnj_matches) else len(texto_email)
-                    
-                    bloco = texto_email[start:end].strip()
-                    
-                    if len(bloco) > 50:
-                        publicacoes.append({
-                            'numero': i + 1,
-                            'texto': bloco
-                        })
-        
         # Último recurso: texto inteiro como uma publicação
         if not publicacoes and len(texto_email) > 30:
-            tem_cnj = re.search(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}', texto_email)
-            if tem_cnj:
+            if primeiro_cnj:
                 publicacoes.append({
                     'numero': 1,
                     'texto': texto_email
@@ -400,6 +582,104 @@ class EmailProcessor:
         
         return publicacoes
     
+    def aguardar_novos_emails(self, timeout):
+        """
+        Aguarda até `timeout` segundos por emails novos usando IMAP IDLE.
+        Retorna True assim que o servidor avisar de nova mensagem.
+        Sem suporte a IDLE no servidor, apenas espera o intervalo.
+        """
+        limite = time.monotonic() + timeout
+        
+        try:
+            self._garantir_conexao()
+            
+            if 'IDLE' not in self.mail.capabilities:
+                time.sleep(timeout)
+                return False
+            
+            if self.mail.state != 'SELECTED':
+                self._selecionar_label()
+            
+            while True:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                if self._idle(min(restante, IDLE_MAXIMO_SEGUNDOS)):
+                    return True
+                
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no IDLE ({e}), aguardando intervalo normal")
+            # Sessão em estado incerto: força reconexão na próxima busca
+            self.mail = None
+            restante = limite - time.monotonic()
+            if restante > 0:
+                time.sleep(restante)
+            return False
+    
+    def _idle(self, segundos):
+        """Executa um ciclo IDLE (RFC 2177); retorna True se chegou mensagem nova"""
+        # Tag própria (prefixo diferente das do imaplib): não usa _new_tag() nem
+        # deixa comando pendente em tagged_commands
+        self._contador_idle += 1
+        tag = b'IDLE%d' % self._contador_idle
+        sock = self.mail.sock
+        timeout_original = sock.gettimeout()
+        # Respostas do servidor (início e fim do IDLE) não podem travar o bot
+        sock.settimeout(TIMEOUT_RESPOSTA_IDLE)
+        
+        try:
+            self.mail.send(tag + b' IDLE\r\n')
+            
+            resposta = self.mail.readline()
+            if not resposta.startswith(b'+'):
+                raise imaplib.IMAP4.error(f"IDLE recusado: {resposta!r}")
+            
+            chegou = False
+            try:
+                limite = time.monotonic() + segundos
+                while not chegou:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    
+                    if not self._resposta_pendente() and not select.select([sock], [], [], restante)[0]:
+                        break
+                    
+                    linha = self.mail.readline()
+                    if not linha:
+                        raise imaplib.IMAP4.abort("conexão encerrada durante IDLE")
+                    chegou = linha.rstrip().upper().endswith((b'EXISTS', b'RECENT'))
+            finally:
+                self.mail.send(b'DONE\r\n')
+                # Consome respostas até a conclusão do comando IDLE
+                while True:
+                    linha = self.mail.readline()
+                    if not linha:
+                        raise imaplib.IMAP4.abort("conexão encerrada ao concluir IDLE")
+                    if linha.startswith(tag + b' '):
+                        break
+        finally:
+            sock.settimeout(timeout_original)
+        
+        return chegou
+    
+    def _resposta_pendente(self):
+        """
+        Há resposta já recebida? Confere o buffer de leitura do imaplib (mail.file),
+        que pode guardar linhas vindas no mesmo pacote do '+ idling' e que o
+        select() no socket não enxerga
+        """
+        sock = self.mail.sock
+        timeout = sock.gettimeout()
+        sock.settimeout(0)
+        try:
+            # Sem bloquear: devolve o que já está no buffer (ou no SSL/socket)
+            return bool(self.mail.file.peek(1))
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return False
+        finally:
+            sock.settimeout(timeout)
+    
     def marcar_email_como_lido(self, email_id):
         """Marca email como lido"""
         try:
@@ -409,9 +689,27 @@ class EmailProcessor:
             self.mail.store(email_id, '+FLAGS', '\\Seen')
             return True
         except Exception as e:
-            print(f"⚠️ Erro ao marcar email como lido: {e}")
+            logger.warning(f"⚠️ Erro ao marcar email como lido: {e}")
             return False
     
+    def marcar_emails_como_lidos(self, email_ids):
+        """Marca vários emails como lidos (um STORE por lote de IDs)"""
+        ids = [
+            email_id.encode() if isinstance(email_id, str) else email_id
+            for email_id in email_ids
+        ]
+        
+        sucesso = True
+        for inicio in range(0, len(ids), TAMANHO_LOTE_STORE):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_STORE]
+            try:
+                self.mail.store(b','.join(lote), '+FLAGS', '\\Seen')
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao marcar emails como lidos: {e}")
+                sucesso = False
+        
+        return sucesso
+    
     def marcar_email_como_nao_lido(self, email_id):
         """Marca email como não lido"""
         try:
@@ -421,7 +719,7 @@ class EmailProcessor:
             self.mail.store(email_id, '-FLAGS', '\\Seen')
             return True
         except Exception as e:
-            print(f"⚠️ Erro ao marcar email como não lido: {e}")
+            logger.warning(f"⚠️ Erro ao marcar email como não lido: {e}")
             return False
     
     def desconectar(self):
@@ -5,38 +5,209 @@ Versão 3.0 - Suporte multi-provedor
 """
 
 import ast
-import requests
 import json
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from abc import ABC, abstractmethod
 
+try:
+    import orjson  # Opcional: decodificação de JSON em C, mais rápida
+except ImportError:
+    orjson = None
 
-class IAProvedor(ABC):
-    """Classe base para provedores de IA"""
+from llm_cache import LLMCache, VERSAO_CACHE
+from sessao_http import criar_sessao
+
+
+# Marca os resultados da extração via regex (quando a IA falha)
+OBSERVACAO_EXTRACAO_BASICA = 'Extração via regex (fallback)'
+
+# Pedidos de correção quando a IA devolve JSON inválido (antes da retentativa)
+TENTATIVAS_REPARO_JSON = 2
+
+# Padrões compilados uma única vez (reutilizados em todas as publicações)
+_RE_DATA_PUB = re.compile(
+    r'data\s+de\s+publica[çc][aã]o\s*:\s*(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})',
+    re.IGNORECASE
+)
+_RE_DATA_PUB_CURTA = re.compile(
+    r'publica[çc][aã]o[^0-9]*(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})',
+    re.IGNORECASE
+)
+_RE_CNJ = re.compile(r'(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})')
+_RE_PRAZO = re.compile(r'prazo\s+de\s+(\d+)\s+dias?')
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_CODEFENCE = re.compile(r'```(?:json)?')
+_RE_VIRGULA_FINAL = re.compile(r',(\s*[}\]])')
+_RE_TRUE = re.compile(r'\btrue\b', re.IGNORECASE)
+_RE_FALSE = re.compile(r'\bfalse\b', re.IGNORECASE)
+_RE_NULL = re.compile(r'\bnull\b', re.IGNORECASE)
+
+# Tipos de ato da extração básica, em ordem de prioridade (busca única com alternância)
+_TIPOS_ATO = [
+    ('sentença', 'Sentença'), ('decisão', 'Decisão'),
+    ('despacho', 'Despacho'), ('intimação', 'Intimação'),
+    ('citação', 'Citação'), ('ato ordinatório', 'Ato Ordinatório')
+]
+_PRIORIDADE_TIPO_ATO = {termo: (prioridade, tipo) for prioridade, (termo, tipo) in enumerate(_TIPOS_ATO)}
+_RE_TIPO_ATO = re.compile('|'.join(re.escape(termo) for termo, _ in _TIPOS_ATO))
+
+# Parte principal (cliente) na extração básica, em ordem de preferência
+_RES_CLIENTE = [
+    re.compile(padrao, re.IGNORECASE | re.DOTALL)
+    for padrao in (
+        r'POLO\s+ATIVO\s*:\s*(.+?)(?=\s+POLO\s+PASSIVO\s*:|\s+ADVOGADO\s*\(|\s+REQUERIDO\s*:|\s+EXECUTADO\s*:|\s+R[EÉ]U\s*:|[\r\n])',
+        r'AUTOR[A]?\s*:\s*(.+?)(?=\s+R[EÉ]U\s*:|\s+ADVOGADO\s*\(|[\r\n])',
+        r'REQUERENTE\s*:\s*(.+?)(?=\s+REQUERIDO\s*:|\s+ADVOGADO\s*\(|[\r\n])',
+        r'EXEQUENTE\s*:\s*(.+?)(?=\s+EXECUTADO\s*:|\s+ADVOGADO\s*\(|[\r\n])',
+    )
+]
+
+
+# Incrementar ao alterar os prompts (invalida as extrações em cache)
+VERSAO_PROMPT = 'v1'
+
+# Prompt de extração: só o texto da publicação varia entre as chamadas
+_PROMPT_INICIO = """Você é um assistente especializado em análise de publicações jurídicas brasileiras.
+
+Analise a publicação abaixo e extraia as informações em formato JSON.
+
+PUBLICAÇÃO:
+"""
+
+_PROMPT_FIM = """
+
+INSTRUÇÕES:
+1. Extraia o número do processo (formato CNJ: 0000000-00.0000.0.00.0000)
+2. Identifique o nome do cliente/parte principal (POLO ATIVO geralmente é nosso cliente)
+3. Identifique o tipo de ato (intimação, citação, decisão, sentença, despacho, etc)
+4. Identifique o tribunal/órgão
+5. Identifique a vara/juízo
+6. IMPORTANTE: Extraia o prazo em DIAS se mencionado (ex: "prazo de 15 dias", "5 dias úteis")
+7. Se não houver prazo expresso, marque "prazo_implicito": true e "prazo_dias": 5
+8. Crie no maximo 3 topicos curtos do que foi determinado
+9. Identifique se há urgência
+
+ATENÇÃO AO PRAZO:
+- Se mencionar "prazo de 15 dias" → prazo_dias: 15
+- Se mencionar "prazo de 5 dias" → prazo_dias: 5
+- Se não mencionar prazo → prazo_implicito: true, prazo_dias: 5
+- Prazos são sempre em dias ÚTEIS, exceto se disser "dias corridos"
+
+FORMATO DE SAÍDA (APENAS JSON, sem explicações):
+{
+  "numero_processo": "0000000-00.0000.0.00.0000",
+  "cliente": "Nome da Parte",
+  "tipo_ato": "Tipo do Ato",
+  "tribunal": "Nome do Tribunal",
+  "vara": "Nome da Vara",
+  "prazo_mencionado": "15 dias" ou null,
+  "prazo_implicito": false,
+  "prazo_dias": 15,
+  "prazo_tipo": "úteis",
+  "resumo_topicos": ["Topico 1", "Topico 2"],
+  "urgente": false,
+  "observacoes": "Observacao curta em uma linha",
+  "confianca": 0.85
+}
+
+IMPORTANTE: Retorne APENAS o JSON, sem markdown, sem explicacoes, sem texto fora do objeto e sem quebrar linhas dentro dos valores.
+
+JSON:"""
+
+
+def _carregar_json(conteudo):
+    """json.loads via orjson quando instalado (aceita str ou bytes)"""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+
+class _LeitorObjetoJSON:
+    """
+    Acompanha a abertura e o fechamento de chaves de um texto recebido aos poucos
+    (ignorando chaves dentro de strings) até fechar o primeiro objeto JSON.
+    """
+    
+    def __init__(self):
+        self.inicio = None  # posição do primeiro '{'
+        self.fim = None     # posição após o '}' que fecha o objeto
+        self._lidos = 0
+        self._profundidade = 0
+        self._em_string = False
+        self._escape = False
+    
+    def alimentar(self, trecho):
+        """Processa mais um trecho do texto; retorna True quando o objeto fechou"""
+        if self.fim is not None:
+            return True
+        
+        for indice, caractere in enumerate(trecho, self._lidos):
+            if self.inicio is None:
+                if caractere != '{':
+                    continue
+                self.inicio = indice
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif caractere == '\\':
+                    self._escape = True
+                elif caractere == '"':
+                    self._em_string = False
+                continue
+            if caractere == '"':
+                self._em_string = True
+            elif caractere == '{':
+                self._profundidade += 1
+            elif caractere == '}':
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    self.fim = indice + 1
+                    return True
+        
+        self._lidos += len(trecho)
+        return False
+
+
+class IAProvedor:
+    """Base dos provedores de IA: cada um implementa gerar_resposta e testar_conexao"""
+    
+    def __init__(self, session=None):
+        self._sessao_propria = session is None
+        self.session = session or criar_sessao(tentativas=2)
     
-    @abstractmethod
     def gerar_resposta(self, prompt):
-        pass
+        """Texto gerado para o prompt, ou None em caso de erro"""
+        raise NotImplementedError
     
-    @abstractmethod
     def testar_conexao(self):
-        pass
+        """(sucesso, mensagem)"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Fecha as conexões HTTP (se a sessão não for compartilhada)"""
+        if self._sessao_propria:
+            self.session.close()
 
 
 class OllamaProvedor(IAProvedor):
     """Provedor Ollama (local)"""
     
-    def __init__(self, config):
+    def __init__(self, config, session=None):
         self.url = config.get('url', 'http://localhost:11434')
         self.modelo = config.get('modelo', 'llama3.1:8b-instruct-q4_K_M')
         self.temperatura = config.get('temperatura', 0.3)
         self.max_tokens = config.get('max_tokens', 2000)
+        super().__init__(session)
     
     def testar_conexao(self):
         """Testa se Ollama está acessível"""
+        from requests.exceptions import ConnectionError as ErroConexao
+        
         try:
-            response = requests.get(f"{self.url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.url}/api/tags", timeout=10)
             if response.status_code == 200:
                 modelos = response.json().get('models', [])
                 modelo_encontrado = any(
@@ -48,29 +219,49 @@ class OllamaProvedor(IAProvedor):
                 else:
                     return False, f"Modelo '{self.modelo}' não encontrado. Disponíveis: {[m.get('name') for m in modelos]}"
             return False, "Ollama não respondeu corretamente"
-        except requests.exceptions.ConnectionError:
+        except ErroConexao:
             return False, f"Não foi possível conectar ao Ollama em {self.url}"
         except Exception as e:
             return False, f"Erro ao conectar: {e}"
     
     def gerar_resposta(self, prompt):
-        """Gera resposta usando Ollama"""
+        """
+        Gera resposta usando Ollama (em streaming).
+        Para de ler assim que o objeto JSON fecha: o resto seria texto descartado
+        e, ao encerrar a conexão, o Ollama interrompe a geração.
+        """
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.url}/api/generate",
                 json={
                     "model": self.modelo,
                     "prompt": prompt,
                     "temperature": self.temperatura,
-                    "stream": False,
+                    "stream": True,
                     "options": {"num_predict": self.max_tokens}
                 },
-                timeout=120
-            )
-            
-            if response.status_code == 200:
-                return response.json().get('response', '')
-            return None
+                timeout=120,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return None
+                
+                partes = []
+                leitor = _LeitorObjetoJSON()
+                for linha in response.iter_lines():
+                    if not linha:
+                        continue
+                    parte = _carregar_json(linha)
+                    if parte.get('error'):
+                        print(f"❌ Erro Ollama: {parte['error']}")
+                        return None
+                    
+                    trecho = parte.get('response', '')
+                    partes.append(trecho)
+                    if leitor.alimentar(trecho) or parte.get('done'):
+                        break
+                
+                return ''.join(partes)
         except Exception as e:
             print(f"❌ Erro Ollama: {e}")
             return None
@@ -79,12 +270,28 @@ class OllamaProvedor(IAProvedor):
 class GeminiProvedor(IAProvedor):
     """Provedor Google Gemini (API)"""
     
-    def __init__(self, config):
+    def __init__(self, config, session=None):
         self.api_key = config.get('api_key', '')
         self.modelo = config.get('modelo', 'gemini-3-flash-preview')
         self.temperatura = config.get('temperatura', 0.3)
         self.max_tokens = config.get('max_tokens', 2000)
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+        super().__init__(session)
+    
+    def aquecer_conexoes(self, quantidade):
+        """
+        Abre de antemão `quantidade` conexões TLS no pool (HEAD simultâneos),
+        para as primeiras chamadas em paralelo não pagarem o handshake
+        """
+        def _head(_):
+            try:
+                self.session.head(self.base_url, timeout=5)
+            except Exception:
+                pass
+        
+        if quantidade > 1:
+            with ThreadPoolExecutor(max_workers=quantidade) as executor:
+                list(executor.map(_head, range(quantidade)))
     
     def testar_conexao(self):
         """Testa se Gemini API está acessível"""
@@ -93,7 +300,7 @@ class GeminiProvedor(IAProvedor):
         
         try:
             url = f"{self.base_url}/{self.modelo}:generateContent?key={self.api_key}"
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json={
                     "contents": [{"parts": [{"text": "Responda apenas: OK"}]}],
@@ -118,7 +325,7 @@ class GeminiProvedor(IAProvedor):
         """Gera resposta usando Gemini"""
         try:
             url = f"{self.base_url}/{self.modelo}:generateContent?key={self.api_key}"
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json={
                     "contents": [{"parts": [{"text": prompt}]}],
@@ -132,7 +339,7 @@ class GeminiProvedor(IAProvedor):
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _carregar_json(response.content)
                 candidates = data.get('candidates', [])
                 if candidates:
                     content = candidates[0].get('content', {})
@@ -157,12 +364,21 @@ class LLMProcessor:
         # Determina qual provedor usar
         provedor_nome = config.get('provedor', 'ollama').lower()
         
+        # max_concorrencia: chamadas simultâneas à IA (Gemini: limite da API;
+        # Ollama: GPU local processa uma geração por vez)
         if provedor_nome == 'gemini':
-            self.provedor = GeminiProvedor(config.get('gemini', {}))
+            provedor_config = config.get('gemini', {})
+            self.provedor = GeminiProvedor(provedor_config)
             self.provedor_nome = 'Gemini'
+            max_concorrencia = provedor_config.get('max_concorrencia', 4)
         else:
-            self.provedor = OllamaProvedor(config.get('ollama', {}))
+            provedor_config = config.get('ollama', {})
+            self.provedor = OllamaProvedor(provedor_config)
             self.provedor_nome = 'Ollama'
+            max_concorrencia = provedor_config.get('max_concorrencia', 1)
+        
+        self.max_concorrencia = max(1, max_concorrencia)
+        self._limite_concorrencia = threading.BoundedSemaphore(self.max_concorrencia)
         
         # Testa conexão
         sucesso, mensagem = self.provedor.testar_conexao()
@@ -171,18 +387,35 @@ class LLMProcessor:
         else:
             print(f"   ❌ {mensagem}")
             raise Exception(f"Falha ao conectar com {self.provedor_nome}: {mensagem}")
+        
+        # Gemini: uma conexão pronta para cada chamada simultânea (o teste já abriu a primeira)
+        if isinstance(self.provedor, GeminiProvedor):
+            self.provedor.aquecer_conexoes(
+                provedor_config.get('conexoes_aquecidas', self.max_concorrencia)
+            )
+        
+        # Cache das extrações (cache_dias = 0 desativa)
+        cache_dias = config.get('cache_dias', 7)
+        self.cache = LLMCache(ttl_dias=cache_dias) if cache_dias else None
+        self.cache_semantico = self._iniciar_cache_semantico(config.get('cache_semantico', {}), cache_dias or 7)
     
     def get_provedor_info(self):
         """Retorna informações do provedor atual"""
         return self.provedor_nome
     
-    def _extrair_data_publicacao(self, texto):
-        """Extrai a data de publicação do texto"""
+    def close(self):
+        """Fecha as conexões HTTP do provedor"""
+        self.provedor.close()
+    
+    def _gerar_resposta(self, prompt):
+        """Chama o provedor respeitando o limite de chamadas simultâneas"""
+        with self._limite_concorrencia:
+            return self.provedor.gerar_resposta(prompt)
+    
+    def _extrair_data_publicacao(self, texto, agora=None):
+        """Extrai a data de publicação do texto (sem data: agora)"""
         # Padrão: "Data de Publicação: DD/MM/YYYY" ou variações
-        match = re.search(
-            r'data\s+de\s+publica[çc][aã]o\s*:\s*(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})',
-            texto, re.IGNORECASE
-        )
+        match = _RE_DATA_PUB.search(texto)
         
         if match:
             dia, mes, ano = match.groups()
@@ -192,10 +425,7 @@ class LLMProcessor:
                 pass
         
         # Padrão 2: "Publicação: DD/MM/YYYY"
-        match = re.search(
-            r'publica[çc][aã]o[^0-9]*(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})',
-            texto, re.IGNORECASE
-        )
+        match = _RE_DATA_PUB_CURTA.search(texto)
         
         if match:
             dia, mes, ano = match.groups()
@@ -204,52 +434,140 @@ class LLMProcessor:
             except ValueError:
                 pass
         
-        return datetime.now()
+        return agora or datetime.now()
     
     def extrair_dados(self, texto_publicacao):
-        """Extrai dados estruturados da publicação usando IA"""
+        """Extrai dados estruturados da publicação usando IA (ou o cache)"""
         
-        data_publicacao = self._extrair_data_publicacao(texto_publicacao)
-        texto_limitado = texto_publicacao[:8000] if len(texto_publicacao) > 8000 else texto_publicacao
+        # Um único instante por extração (data padrão e processado_em)
+        agora = datetime.now()
+        data_publicacao = self._extrair_data_publicacao(texto_publicacao, agora)
+        # A IA e a extração básica só olham os primeiros 8000 caracteres
+        texto_limitado = texto_publicacao[:8000]
         
-        prompt = self._montar_prompt(texto_limitado, data_publicacao)
+        chave = None
+        if self.cache is not None:
+            chave = LLMCache.gerar_chave(
+                VERSAO_CACHE, VERSAO_PROMPT, self.provedor_nome, self.provedor.modelo, texto_limitado
+            )
         
         try:
-            resposta = self.provedor.gerar_resposta(prompt)
-            
-            if resposta:
-                dados = self._extrair_json(resposta)
+            dados = self._buscar_cache(chave, texto_publicacao)
+            if dados is None:
+                dados = self._extrair_com_ia(texto_limitado, data_publicacao)
                 
-                if dados:
-                    return self._finalizar_dados_extraidos(dados, data_publicacao)
-
-                print("AVISO | JSON invalido na primeira resposta, tentando reparo automatico...")
-                resposta_reparo = self.provedor.gerar_resposta(self._montar_prompt_reparo_json(resposta))
-                if resposta_reparo:
-                    dados = self._extrair_json(resposta_reparo)
-                    if dados:
-                        return self._finalizar_dados_extraidos(dados, data_publicacao)
-
-            print("AVISO | Retentando a geracao com prompt mais curto...")
-            resposta_retentativa = self.provedor.gerar_resposta(
-                self._montar_prompt_retentativa(texto_limitado, data_publicacao)
-            )
-            if resposta_retentativa:
-                dados = self._extrair_json(resposta_retentativa)
-                if dados:
-                    return self._finalizar_dados_extraidos(dados, data_publicacao)
+                if dados is None:
+                    print("⚠️ IA não retornou JSON válido, tentando extração básica...")
+                    return self._extrair_dados_basico(texto_limitado, data_publicacao, agora)
+                
+                # Só a resposta da IA vai para o cache (a extração básica não)
+                self._gravar_cache(chave, texto_publicacao, dados)
             
-            print("⚠️ IA não retornou JSON válido, tentando extração básica...")
-            return self._extrair_dados_basico(texto_publicacao, data_publicacao)
+            # Data de publicação e prazo são sempre recalculados para este texto
+            return self._finalizar_dados_extraidos(dict(dados), data_publicacao, agora)
             
         except Exception as e:
             print(f"❌ Erro ao processar: {e}")
-            return self._extrair_dados_basico(texto_publicacao, data_publicacao)
+            return self._extrair_dados_basico(texto_limitado, data_publicacao, agora)
+
+    def _extrair_com_ia(self, texto_limitado, data_publicacao):
+        """Chama a IA (com reparo e retentativa); retorna o JSON extraído ou None"""
+        print(f"🧠 Analisando com IA ({self.provedor_nome})...")
+        resposta = self._gerar_resposta(self._montar_prompt(texto_limitado, data_publicacao))
+        
+        if resposta:
+            dados = self._extrair_json(resposta)
+            
+            if dados:
+                return dados
+
+            # Devolve a resposta inválida à IA pedindo só o JSON corrigido
+            for tentativa in range(1, TENTATIVAS_REPARO_JSON + 1):
+                print(f"AVISO | JSON invalido, tentando reparo automatico ({tentativa}/{TENTATIVAS_REPARO_JSON})...")
+                resposta_reparo = self._gerar_resposta(self._montar_prompt_reparo_json(resposta))
+                if not resposta_reparo:
+                    # Falha do provedor (ex.: limite de taxa): espera antes de tentar de novo
+                    time.sleep(tentativa)
+                    continue
+                dados = self._extrair_json(resposta_reparo)
+                if dados:
+                    return dados
+                resposta = resposta_reparo
+
+        print("AVISO | Retentando a geracao com prompt mais curto...")
+        resposta_retentativa = self._gerar_resposta(
+            self._montar_prompt_retentativa(texto_limitado, data_publicacao)
+        )
+        if resposta_retentativa:
+            dados = self._extrair_json(resposta_retentativa)
+            if dados:
+                return dados
+        
+        return None
+
+    def _buscar_cache(self, chave, texto_publicacao):
+        """Extração já feita para este texto (cache exato) ou para um quase igual (semântico)"""
+        if chave is not None:
+            dados = self.cache.get(chave)
+            if dados:
+                print("♻️ Publicação já analisada - usando dados do cache")
+                return dados
+        
+        if self.cache_semantico is not None:
+            dados = self.cache_semantico.buscar(texto_publicacao)
+            if dados:
+                print("♻️ Publicação semelhante já analisada - reaproveitando dados")
+                if chave is not None:
+                    self.cache.set(chave, dados)
+                return dados
+        
+        return None
+
+    def _gravar_cache(self, chave, texto_publicacao, dados):
+        """Guarda a extração da IA (sem os campos calculados) nos caches ativos"""
+        if chave is not None:
+            self.cache.set(chave, dados)
+        if self.cache_semantico is not None:
+            self.cache_semantico.adicionar(texto_publicacao, dict(dados))
+
+    def _iniciar_cache_semantico(self, config, ttl_dias):
+        """Carrega o cache semântico se ativado (requer sentence-transformers)"""
+        if not config.get('ativo', False):
+            return None
+        
+        try:
+            from semantic_cache import SemanticCache
+            # Mudar versão do prompt, provedor ou modelo invalida as extrações gravadas
+            escopo = {
+                'versao': VERSAO_CACHE,
+                'prompt': VERSAO_PROMPT,
+                'provedor': self.provedor_nome,
+                'modelo': self.provedor.modelo
+            }
+            cache = SemanticCache(config, escopo, ttl_dias=ttl_dias)
+            print(f"   ✅ Cache semântico ativo ({len(cache.entradas)} extrações)")
+            return cache
+        except ImportError as e:
+            print(f"   ⚠️ Cache semântico desativado - dependência ausente: {e}")
+        except Exception as e:
+            print(f"   ⚠️ Cache semântico desativado: {e}")
+        return None
+
+    def extrair_dados_lote(self, textos, max_workers=None):
+        """
+        Extrai dados de várias publicações em paralelo (resultados na ordem de `textos`).
+        As chamadas simultâneas à IA continuam limitadas por max_concorrencia.
+        """
+        if not textos:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_concorrencia) as executor:
+            return list(executor.map(self.extrair_dados, textos))
 
-    def _finalizar_dados_extraidos(self, dados, data_publicacao):
+    def _finalizar_dados_extraidos(self, dados, data_publicacao, agora=None):
         dados['data_publicacao'] = data_publicacao.strftime("%d/%m/%Y")
         dados['prazo_calculado'] = self._calcular_prazo(dados, data_publicacao)
-        dados['processado_em'] = datetime.now().isoformat()
+        dados['processado_em'] = (agora or datetime.now()).isoformat()
         dados['provedor_ia'] = self.provedor_nome
         return dados
 
@@ -293,79 +611,16 @@ JSON:"""
     
     def _montar_prompt(self, texto, data_publicacao):
         """Monta prompt para extração de dados jurídicos"""
-        
-        return f"""Você é um assistente especializado em análise de publicações jurídicas brasileiras.
-
-Analise a publicação abaixo e extraia as informações em formato JSON.
-
-PUBLICAÇÃO:
-{texto}
-
-INSTRUÇÕES:
-1. Extraia o número do processo (formato CNJ: 0000000-00.0000.0.00.0000)
-2. Identifique o nome do cliente/parte principal (POLO ATIVO geralmente é nosso cliente)
-3. Identifique o tipo de ato (intimação, citação, decisão, sentença, despacho, etc)
-4. Identifique o tribunal/órgão
-5. Identifique a vara/juízo
-6. IMPORTANTE: Extraia o prazo em DIAS se mencionado (ex: "prazo de 15 dias", "5 dias úteis")
-7. Se não houver prazo expresso, marque "prazo_implicito": true e "prazo_dias": 5
-8. Crie no maximo 3 topicos curtos do que foi determinado
-9. Identifique se há urgência
-
-ATENÇÃO AO PRAZO:
-- Se mencionar "prazo de 15 dias" → prazo_dias: 15
-- Se mencionar "prazo de 5 dias" → prazo_dias: 5
-- Se não mencionar prazo → prazo_implicito: true, prazo_dias: 5
-- Prazos são sempre em dias ÚTEIS, exceto se disser "dias corridos"
-
-FORMATO DE SAÍDA (APENAS JSON, sem explicações):
-{{
-  "numero_processo": "0000000-00.0000.0.00.0000",
-  "cliente": "Nome da Parte",
-  "tipo_ato": "Tipo do Ato",
-  "tribunal": "Nome do Tribunal",
-  "vara": "Nome da Vara",
-  "prazo_mencionado": "15 dias" ou null,
-  "prazo_implicito": false,
-  "prazo_dias": 15,
-  "prazo_tipo": "úteis",
-  "resumo_topicos": ["Topico 1", "Topico 2"],
-  "urgente": false,
-  "observacoes": "Observacao curta em uma linha",
-  "confianca": 0.85
-}}
-
-IMPORTANTE: Retorne APENAS o JSON, sem markdown, sem explicacoes, sem texto fora do objeto e sem quebrar linhas dentro dos valores.
-
-JSON:"""
+        return _PROMPT_INICIO + texto + _PROMPT_FIM
     
     def _extrair_primeiro_objeto_json(self, texto):
         """Extrai o primeiro objeto JSON balanceado da resposta."""
-        inicio = texto.find('{')
-        if inicio == -1:
+        leitor = _LeitorObjetoJSON()
+        if leitor.alimentar(texto):
+            return texto[leitor.inicio:leitor.fim]
+        if leitor.inicio is None:
             return texto
-        profundidade = 0
-        em_string = False
-        escape = False
-        for indice in range(inicio, len(texto)):
-            caractere = texto[indice]
-            if em_string:
-                if escape:
-                    escape = False
-                elif caractere == '\\':
-                    escape = True
-                elif caractere == '"':
-                    em_string = False
-                continue
-            if caractere == '"':
-                em_string = True
-            elif caractere == '{':
-                profundidade += 1
-            elif caractere == '}':
-                profundidade -= 1
-                if profundidade == 0:
-                    return texto[inicio:indice + 1]
-        return texto[inicio:]
+        return texto[leitor.inicio:]
     def _normalizar_json_bruto(self, texto):
         """Aplica pequenos reparos em JSON malformado pelo modelo."""
         resultado = []
@@ -399,7 +654,7 @@ JSON:"""
                 em_string = True
             resultado.append(caractere)
         texto_normalizado = ''.join(resultado)
-        texto_normalizado = re.sub(r',(\s*[}\]])', r'\1', texto_normalizado)
+        texto_normalizado = _RE_VIRGULA_FINAL.sub(r'\1', texto_normalizado)
         return texto_normalizado.strip()
     def _parse_json_tolerante(self, texto):
         """Tenta decodificar JSON com pequenas tolerancias."""
@@ -416,14 +671,14 @@ JSON:"""
             normalizado = self._normalizar_json_bruto(bruto)
             for tentativa in (bruto, normalizado):
                 try:
-                    return json.loads(tentativa)
+                    return _carregar_json(tentativa)
                 except Exception:
                     pass
             try:
                 convertido = normalizado
-                convertido = re.sub(r'\btrue\b', 'True', convertido, flags=re.IGNORECASE)
-                convertido = re.sub(r'\bfalse\b', 'False', convertido, flags=re.IGNORECASE)
-                convertido = re.sub(r'\bnull\b', 'None', convertido, flags=re.IGNORECASE)
+                convertido = _RE_TRUE.sub('True', convertido)
+                convertido = _RE_FALSE.sub('False', convertido)
+                convertido = _RE_NULL.sub('None', convertido)
                 dados = ast.literal_eval(convertido)
                 if isinstance(dados, dict):
                     return dados
@@ -433,7 +688,18 @@ JSON:"""
     def _extrair_json(self, texto):
         """Extrai JSON da resposta da IA"""
         try:
-            texto = texto.replace('```json', '').replace('```', '').strip()
+            texto = texto.strip()
+            
+            # Caso comum (Gemini com responseMimeType JSON): a resposta já é o objeto
+            try:
+                dados = _carregar_json(texto)
+                if isinstance(dados, dict):
+                    return dados
+            except ValueError:
+                pass
+            
+            if '```' in texto:
+                texto = _RE_CODEFENCE.sub('', texto).strip()
             dados = self._parse_json_tolerante(texto)
             if dados is not None:
                 return dados
@@ -441,7 +707,7 @@ JSON:"""
         except Exception as e:
             print(f"AVISO | Erro ao extrair JSON: {e}")
             return None
-    def _extrair_dados_basico(self, texto, data_publicacao):
+    def _extrair_dados_basico(self, texto, data_publicacao, agora=None):
         """Extração básica via regex (fallback)"""
         dados = {
             'numero_processo': None,
@@ -455,15 +721,15 @@ JSON:"""
             'prazo_tipo': 'úteis',
             'resumo_topicos': ['Verificar manualmente'],
             'urgente': False,
-            'observacoes': 'Extração via regex (fallback)',
+            'observacoes': OBSERVACAO_EXTRACAO_BASICA,
             'confianca': 0.3,
             'data_publicacao': data_publicacao.strftime("%d/%m/%Y"),
-            'processado_em': datetime.now().isoformat(),
+            'processado_em': (agora or datetime.now()).isoformat(),
             'provedor_ia': self.provedor_nome
         }
         
-        # Extrai número CNJ
-        cnj_match = re.search(r'(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})', texto)
+        # Extrai número CNJ (sem hífen no texto não há número a procurar)
+        cnj_match = _RE_CNJ.search(texto) if '-' in texto else None
         if cnj_match:
             dados['numero_processo'] = cnj_match.group(1)
         
@@ -471,21 +737,20 @@ JSON:"""
         if cliente:
             dados['cliente'] = cliente
         
-        # Identifica tipo de ato
-        tipos_ato = [
-            ('sentença', 'Sentença'), ('decisão', 'Decisão'),
-            ('despacho', 'Despacho'), ('intimação', 'Intimação'),
-            ('citação', 'Citação'), ('ato ordinatório', 'Ato Ordinatório')
-        ]
-        
+        # Identifica tipo de ato (o de maior prioridade presente no texto)
         texto_lower = texto.lower()
-        for termo, tipo in tipos_ato:
-            if termo in texto_lower:
-                dados['tipo_ato'] = tipo
-                break
+        melhor = None
+        for match in _RE_TIPO_ATO.finditer(texto_lower):
+            prioridade, tipo = _PRIORIDADE_TIPO_ATO[match.group(0)]
+            if melhor is None or prioridade < melhor[0]:
+                melhor = (prioridade, tipo)
+                if prioridade == 0:
+                    break
+        if melhor:
+            dados['tipo_ato'] = melhor[1]
         
         # Extrai prazo
-        prazo_match = re.search(r'prazo\s+de\s+(\d+)\s+dias?', texto_lower)
+        prazo_match = _RE_PRAZO.search(texto_lower)
         if prazo_match:
             dados['prazo_dias'] = int(prazo_match.group(1))
             dados['prazo_implicito'] = False
@@ -494,19 +759,12 @@ JSON:"""
         return dados
 
     def _extrair_cliente_basico(self, texto):
-        padroes = [
-            r'POLO\s+ATIVO\s*:\s*(.+?)(?=\s+POLO\s+PASSIVO\s*:|\s+ADVOGADO\s*\(|\s+REQUERIDO\s*:|\s+EXECUTADO\s*:|\s+R[EÉ]U\s*:|[\r\n])',
-            r'AUTOR[A]?\s*:\s*(.+?)(?=\s+R[EÉ]U\s*:|\s+ADVOGADO\s*\(|[\r\n])',
-            r'REQUERENTE\s*:\s*(.+?)(?=\s+REQUERIDO\s*:|\s+ADVOGADO\s*\(|[\r\n])',
-            r'EXEQUENTE\s*:\s*(.+?)(?=\s+EXECUTADO\s*:|\s+ADVOGADO\s*\(|[\r\n])',
-        ]
-
-        for padrao in padroes:
-            match = re.search(padrao, texto, re.IGNORECASE | re.DOTALL)
+        for padrao in _RES_CLIENTE:
+            match = padrao.search(texto)
             if not match:
                 continue
 
-            cliente = re.sub(r'\s+', ' ', match.group(1)).strip(' :-;,.')
+            cliente = _RE_ESPACOS.sub(' ', match.group(1)).strip(' :-;,.')
             if cliente:
                 return cliente
 
@@ -521,9 +779,9 @@ JSON:"""
             # Inicia no dia SEGUINTE à publicação
             data_inicio = data_publicacao + timedelta(days=1)
             
-            # Se não for dia útil, avança
-            while data_inicio.weekday() >= 5:
-                data_inicio += timedelta(days=1)
+            # Se cair no fim de semana, avança para segunda-feira
+            if data_inicio.weekday() >= 5:
+                data_inicio += timedelta(days=7 - data_inicio.weekday())
             
             if tipo == 'úteis':
                 prazo_final = self._adicionar_dias_uteis(data_inicio, dias)
@@ -536,13 +794,21 @@ JSON:"""
             return None
     
     def _adicionar_dias_uteis(self, data_inicial, dias):
-        """Adiciona dias úteis"""
-        data_atual = data_inicial
-        dias_contados = 1
+        """Adiciona dias úteis (data_inicial conta como o 1º dia), sem percorrer dia a dia"""
+        restantes = max(dias - 1, 0)
+        if not restantes:
+            return data_inicial
+        
+        # Início no fim de semana: conta como se fosse a sexta-feira anterior
+        dia_semana = data_inicial.weekday()
+        if dia_semana >= 5:
+            data_inicial -= timedelta(days=dia_semana - 4)
+            dia_semana = 4
         
-        while dias_contados < dias:
-            data_atual += timedelta(days=1)
-            if data_atual.weekday() < 5:
-                dias_contados += 1
+        # Cada 5 dias úteis = 1 semana; o resto pode atravessar um fim de semana
+        semanas, resto = divmod(restantes, 5)
+        dias_corridos = semanas * 7 + resto
+        if dia_semana + resto >= 5:
+            dias_corridos += 2
         
-        return data_atual
+        return data_inicial + timedelta(days=dias_corridos)
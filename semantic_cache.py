@@ -0,0 +1,158 @@
+"""
+Cache semântico das extrações feitas pela IA
+Reaproveita a extração de publicações quase idênticas (mesmo processo, mas com
+pequenas diferenças de texto como horário ou número de protocolo) usando
+embeddings calculados localmente.
+
+Requer: pip install sentence-transformers (opcional, desativado por padrão)
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+_RE_CNJ = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+
+
+def _processos(texto):
+    """Números CNJ citados no texto (só reaproveita entre publicações do mesmo processo)"""
+    return sorted(set(_RE_CNJ.findall(texto)))
+
+
+class SemanticCache:
+    def __init__(self, config, escopo, ttl_dias=7, diretorio='data/semantic_cache'):
+        """
+        Carrega o modelo de embeddings e as extrações já gravadas
+        escopo: versões do cache/prompt, provedor e modelo da IA; entradas de
+        outro escopo (ou mais antigas que ttl_dias) não são reaproveitadas
+        """
+        # Dependências pesadas: importadas só quando o cache semântico está ativo
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+
+        self._np = np
+        self.modelo = SentenceTransformer(config.get('modelo', 'all-MiniLM-L6-v2'))
+        self.limiar = config.get('limiar', 0.92)
+        self.max_entradas = max(1, config.get('max_entradas', 5000))
+        self.escopo = dict(escopo)
+        self.ttl_segundos = ttl_dias * 24 * 60 * 60
+
+        self.diretorio = Path(diretorio)
+        # Vetores float32 crus, um após o outro: novas entradas são só acrescentadas
+        self._arquivo_vetores = self.diretorio / 'embeddings.f32'
+        self._arquivo_extracoes = self.diretorio / 'extracoes.jsonl'
+        self._dimensao = self.modelo.get_sentence_embedding_dimension()
+        self._lock = threading.Lock()
+
+        self.vetores, self.entradas = self._carregar()
+
+    def _valida(self, entrada, agora):
+        """Entrada do escopo atual e dentro do prazo de validade"""
+        return entrada.get('escopo') == self.escopo and agora - entrada.get('ts', 0) < self.ttl_segundos
+
+    def _carregar(self):
+        """Lê vetores e extrações, descartando entradas de outro escopo, expiradas ou excedentes"""
+        np = self._np
+        vazio = np.empty((0, self._dimensao), dtype=np.float32)
+
+        if not self._arquivo_vetores.exists() and not self._arquivo_extracoes.exists():
+            return vazio, []
+
+        try:
+            # frombuffer recusa um vetor gravado pela metade (tamanho não múltiplo de 4)
+            vetores = np.frombuffer(self._arquivo_vetores.read_bytes(), dtype=np.float32)
+            with open(self._arquivo_extracoes, 'r', encoding='utf-8') as f:
+                entradas = [json.loads(linha) for linha in f if linha.strip()]
+        except (OSError, ValueError):
+            vetores, entradas = vazio, None
+
+        if entradas is None or vetores.size != len(entradas) * self._dimensao:
+            print("   ⚠️ Cache semântico inconsistente, recomeçando do zero")
+            vetores, entradas, validos = vazio, [], []
+        else:
+            vetores = vetores.reshape(-1, self._dimensao)
+            agora = time.time()
+            validos = [i for i, entrada in enumerate(entradas) if self._valida(entrada, agora)]
+            validos = validos[-self.max_entradas:]
+
+        # Arquivos só recebem acréscimos: compacta aqui o que não vale mais
+        if len(validos) != len(entradas) or not validos:
+            vetores, entradas = vetores[validos], [entradas[i] for i in validos]
+            try:
+                self._reescrever(vetores, entradas)
+            except OSError as e:
+                print(f"⚠️ Erro ao compactar cache semântico: {e}")
+        return vetores, entradas
+
+    def _embedding(self, texto):
+        """Vetor normalizado (similaridade de cosseno = produto escalar)"""
+        vetor = self.modelo.encode([texto], normalize_embeddings=True)[0]
+        return vetor.astype(self._np.float32)
+
+    def buscar(self, texto):
+        """Retorna a extração de uma publicação semelhante do mesmo processo, ou None"""
+        with self._lock:
+            if not self.entradas:
+                return None
+            vetores, entradas = self.vetores, self.entradas
+
+        similaridades = vetores @ self._embedding(texto)
+        processos = _processos(texto)
+        agora = time.time()
+
+        for indice in similaridades.argsort()[::-1]:
+            if similaridades[indice] < self.limiar:
+                break
+            entrada = entradas[indice]
+            if entrada.get('processos') == processos and self._valida(entrada, agora):
+                return entrada['dados']
+
+        return None
+
+    def adicionar(self, texto, dados):
+        """Acrescenta a extração aos arquivos (compacta ao passar de max_entradas)"""
+        vetor = self._embedding(texto)
+        entrada = {'escopo': self.escopo, 'ts': time.time(), 'processos': _processos(texto), 'dados': dados}
+
+        with self._lock:
+            self.vetores = self._np.vstack([self.vetores, vetor])
+            self.entradas = self.entradas + [entrada]
+            try:
+                if len(self.entradas) > self.max_entradas:
+                    # Mantém as mais recentes, com folga para não reescrever a cada nova entrada
+                    manter = int(self.max_entradas * 0.9) or 1
+                    self.vetores, self.entradas = self.vetores[-manter:], self.entradas[-manter:]
+                    self._reescrever(self.vetores, self.entradas)
+                else:
+                    self._acrescentar(vetor, entrada)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"⚠️ Erro ao gravar cache semântico: {e}")
+
+    def _acrescentar(self, vetor, entrada):
+        """Grava só a nova entrada no fim dos dois arquivos"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        linha = json.dumps(entrada, ensure_ascii=False) + '\n'
+        with open(self._arquivo_extracoes, 'a', encoding='utf-8') as f:
+            f.write(linha)
+        with open(self._arquivo_vetores, 'ab') as f:
+            vetor.tofile(f)
+
+    def _reescrever(self, vetores, entradas):
+        """Reescreve os dois arquivos de forma atômica"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.f32')
+        with os.fdopen(fd, 'wb') as f:
+            vetores.astype(self._np.float32).tofile(f)
+        os.replace(temporario, self._arquivo_vetores)
+
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.jsonl')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for entrada in entradas:
+                f.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+        os.replace(temporario, self._arquivo_extracoes)
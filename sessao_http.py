@@ -0,0 +1,70 @@
+"""
+Sessão HTTP com pool de conexões
+Reaproveita as conexões TCP/TLS (keep-alive) entre as chamadas às APIs,
+em vez de abrir uma conexão nova a cada requisição
+"""
+
+import socket
+
+
+# Respostas transitórias que valem nova tentativa (limite de taxa e gateway)
+STATUS_RETENTATIVA = (429, 502, 503, 504)
+
+# TCP keepalive: no modo contínuo as conexões ficam ociosas entre os ciclos e
+# roteadores/NAT descartam as silenciosas (sondas após 60s, a cada 20s, 3 falhas)
+KEEPALIVE_OCIOSO = 60
+KEEPALIVE_INTERVALO = 20
+KEEPALIVE_SONDAS = 3
+
+
+def _opcoes_keepalive():
+    """socket_options do urllib3 com keepalive (só as constantes que o sistema tem)"""
+    from urllib3.connection import HTTPConnection
+    
+    opcoes = list(HTTPConnection.default_socket_options)
+    opcoes.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for nome, valor in (
+        ('TCP_KEEPIDLE', KEEPALIVE_OCIOSO),
+        ('TCP_KEEPINTVL', KEEPALIVE_INTERVALO),
+        ('TCP_KEEPCNT', KEEPALIVE_SONDAS),
+    ):
+        if hasattr(socket, nome):
+            opcoes.append((socket.IPPROTO_TCP, getattr(socket, nome), valor))
+    return opcoes
+
+
+def criar_sessao(pool_connections=4, pool_maxsize=16, tentativas=0):
+    """
+    Cria requests.Session com pool de conexões (e TCP keepalive) para http:// e https://
+    tentativas: novas tentativas em falha de conexão e, nos métodos idempotentes
+    (GET), também nos status de STATUS_RETENTATIVA (POST não é repetido)
+    """
+    # requests/urllib3 só são carregados quando alguma sessão é de fato criada
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    opcoes_socket = _opcoes_keepalive()
+    
+    class AdaptadorKeepAlive(HTTPAdapter):
+        """HTTPAdapter cujo pool abre sockets com TCP keepalive"""
+        
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs.setdefault('socket_options', opcoes_socket)
+            super().init_poolmanager(*args, **kwargs)
+    
+    session = requests.Session()
+    retry = Retry(
+        total=tentativas,
+        backoff_factor=0.3,
+        status_forcelist=STATUS_RETENTATIVA,
+        raise_on_status=False
+    ) if tentativas else 0
+    adaptador = AdaptadorKeepAlive(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+    session.mount('https://', adaptador)
+    session.mount('http://', adaptador)
+    return session
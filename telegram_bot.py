@@ -4,17 +4,29 @@ Envia alertas sobre novas publicações processadas
 Versão Opus
 """
 
-import requests
+import html
+import queue
+import threading
 from datetime import datetime
 
+from sessao_http import criar_sessao
+
 
 class TelegramNotifier:
-    def __init__(self, config):
-        """Inicializa notificador do Telegram"""
+    def __init__(self, config, session=None):
+        """Inicializa notificador do Telegram (session: requests.Session compartilhada)"""
         self.token = config.get('token', '')
         self.chat_id = config.get('chat_id', '')
         
         self.base_url = f"https://api.telegram.org/bot{self.token}"
+        # Só fecha em close() a sessão criada aqui (a compartilhada é do chamador)
+        self._sessao_propria = session is None
+        self.session = session or criar_sessao(tentativas=2)
+        
+        # Envios em segundo plano: o processamento não espera a API do Telegram
+        self._fila = queue.Queue()
+        self._worker = None
+        self._lock_worker = threading.Lock()
         
         # Testa conexão se configurado
         if self.token and self.chat_id:
@@ -25,7 +37,7 @@ class TelegramNotifier:
     def _testar_conexao(self):
         """Testa se o bot do Telegram está acessível"""
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=10)
+            response = self.session.get(f"{self.base_url}/getMe", timeout=10)
             if response.status_code == 200:
                 bot_info = response.json()
                 if bot_info.get('ok'):
@@ -38,11 +50,47 @@ class TelegramNotifier:
             print(f"   ⚠️ Telegram: erro ao conectar - {e}")
             return False
     
+    def close(self):
+        """Envia o que estiver na fila e fecha as conexões HTTP (se a sessão não for compartilhada)"""
+        with self._lock_worker:
+            if self._worker is not None:
+                self._fila.put(None)
+                self._worker.join()
+                self._worker = None
+        if self._sessao_propria:
+            self.session.close()
+    
+    def aguardar_envios(self):
+        """Bloqueia até todas as mensagens enfileiradas serem enviadas"""
+        self._fila.join()
+    
     def enviar_mensagem(self, mensagem):
-        """Envia mensagem para o chat configurado"""
+        """Enfileira mensagem para o chat configurado (True se foi para a fila)"""
         if not self.token or not self.chat_id:
             return False
         
+        with self._lock_worker:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._processar_fila, daemon=True)
+                self._worker.start()
+        
+        self._fila.put(mensagem)
+        return True
+    
+    def _processar_fila(self):
+        """Worker: envia as mensagens na ordem em que foram enfileiradas"""
+        while True:
+            mensagem = self._fila.get()
+            try:
+                if mensagem is None:
+                    return
+                if not self._enviar(mensagem):
+                    print("⚠️ Notificação Telegram não enviada")
+            finally:
+                self._fila.task_done()
+    
+    def _enviar(self, mensagem):
+        """Envia mensagem para o chat configurado (bloqueante)"""
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -52,7 +100,7 @@ class TelegramNotifier:
                 'disable_web_page_preview': True
             }
             
-            response = requests.post(url, data=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             return response.status_code == 200
             
         except Exception as e:
@@ -73,6 +121,12 @@ class TelegramNotifier:
         if len(str(cliente)) > 45:
             cliente = str(cliente)[:45] + '...'
         
+        # parse_mode HTML: '<' ou '&' nos dados fariam o Telegram recusar a mensagem
+        processo, cliente, tipo, tribunal, prazo = (
+            html.escape(str(valor)) for valor in (processo, cliente, tipo, tribunal, prazo)
+        )
+        card_url = html.escape(str(card_url), quote=True)
+        
         # Monta linha de urgência/prazo implícito
         avisos = ""
         if dados.get('urgente'):
@@ -92,13 +146,14 @@ class TelegramNotifier:
         
         return self.enviar_mensagem(mensagem)
     
-    def enviar_resumo_diario(self, sucesso, falhas, ignorados=0):
+    def enviar_resumo_diario(self, sucesso, falhas, ignorados=0, duplicadas=0):
         """Envia resumo do processamento"""
         
         total = sucesso + falhas
-        cards_criados = sucesso - ignorados
-        hora = datetime.now().strftime("%H:%M")
-        data = datetime.now().strftime("%d/%m/%Y")
+        cards_criados = sucesso - ignorados - duplicadas
+        agora = datetime.now()
+        hora = agora.strftime("%H:%M")
+        data = agora.strftime("%d/%m/%Y")
         
         if total == 0:
             mensagem = f"""📊 <b>RESUMO - {data} {hora}</b>
@@ -108,6 +163,8 @@ class TelegramNotifier:
             taxa = (sucesso / total * 100) if total > 0 else 0
             
             ignorados_texto = f"\n   ⏭️ Ignorados (lista especial): {ignorados}" if ignorados > 0 else ""
+            if duplicadas > 0:
+                ignorados_texto += f"\n   ♻️ Já processadas antes: {duplicadas}"
             mensagem = f"""📊 <b>RESUMO - {data} {hora}</b>
 
 📬 <b>Total de publicações:</b> {total}
@@ -123,7 +180,7 @@ class TelegramNotifier:
         
         mensagem = f"""🚨 <b>ERRO NO BOT DE PUBLICAÇÕES</b>
 
-❌ <b>Erro:</b> {str(erro)[:500]}
+❌ <b>Erro:</b> {html.escape(str(erro)[:500])}
 
 ⏰ <b>Horário:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}
 
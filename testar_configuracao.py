@@ -10,9 +10,15 @@ Testa cada componente individualmente:
 5. Lista Especial
 """
 
+import hashlib
+import io
 import json
+import logging
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -37,8 +43,54 @@ def azul(texto):
     return cor(texto, '94')
 
 
-def testar_email(config):
-    """Testa conexão com email"""
+class SaidaPorThread:
+    """
+    Substitui sys.stdout: nas threads de teste, a saída vai para um buffer
+    da própria thread (as mensagens de testes paralelos não se misturam)
+    """
+    
+    def __init__(self, saida):
+        self._saida = saida
+        self._local = threading.local()
+    
+    def _destino(self):
+        return getattr(self._local, 'buffer', None) or self._saida
+    
+    def write(self, texto):
+        return self._destino().write(texto)
+    
+    def flush(self):
+        self._destino().flush()
+    
+    def __getattr__(self, nome):
+        return getattr(self._saida, nome)
+    
+    def executar(self, funcao, *args):
+        """Executa funcao(*args) capturando o que ela imprime; retorna (resultado, saída)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return funcao(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+
+# Sessão HTTP única dos testes (Ollama/Gemini, Trello e Telegram reaproveitam conexões)
+_sessao = None
+_lock_sessao = threading.Lock()
+
+
+def _sessao_http():
+    """Cria a sessão compartilhada no primeiro uso (requests só é importado aqui)"""
+    global _sessao
+    with _lock_sessao:
+        if _sessao is None:
+            from sessao_http import criar_sessao
+            _sessao = criar_sessao(tentativas=2)
+        return _sessao
+
+
+def testar_email(config, completo=False):
+    """Testa conexão com email (completo: processa os emails não lidos)"""
     print(f"\n{azul('=' * 60)}")
     print(azul('📧 TESTANDO CONEXÃO COM EMAIL'))
     print(azul('=' * 60))
@@ -60,11 +112,20 @@ def testar_email(config):
             qtd = len(messages[0].split()) if messages[0] else 0
             print(f"   {verde('✅ Conexão OK - ' + str(qtd) + ' email(s) não lido(s)')}")
             
-            if qtd > 0:
-                print("\n   Testando processamento do primeiro email...")
+            if qtd > 0 and completo:
+                print("\n   Testando processamento dos emails...")
                 emails = processor.buscar_emails_novos(dias=7)
                 if emails:
                     print(f"   {verde('✅ ' + str(len(emails)) + ' publicação(ões) identificada(s)')}")
+            elif qtd > 0:
+                # Só o cabeçalho (PEEK não marca como lido); processamento com --completo
+                print("\n   Testando leitura do primeiro email...")
+                primeiro = messages[0].split()[0]
+                status, dados = processor.mail.fetch(primeiro, '(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM)])')
+                if status == 'OK':
+                    print(f"   {verde('✅ Leitura OK')} (python testar_configuracao.py --completo processa os emails)")
+                else:
+                    print(f"   {amarelo('⚠️ Não foi possível ler o email: ' + str(status))}")
         
         processor.desconectar()
         return True
@@ -89,6 +150,41 @@ def testar_ia(config):
         return testar_ollama(config.get('ollama', {}))
 
 
+# Geração de teste bem-sucedida vale por 1 hora (evita custo/latência a cada execução)
+ARQUIVO_CACHE_TESTE_IA = '.bot_test_cache.json'
+TTL_CACHE_TESTE_IA = 60 * 60
+
+
+def _chave_teste_ia(*campos):
+    """Identifica provedor/modelo/credencial sem gravar a credencial"""
+    return hashlib.sha256('|'.join(campos).encode('utf-8')).hexdigest()
+
+
+def _teste_ia_recente(chave):
+    """True se a geração de teste passou há menos de TTL_CACHE_TESTE_IA"""
+    try:
+        with open(ARQUIVO_CACHE_TESTE_IA, 'r', encoding='utf-8') as f:
+            entrada = json.load(f)[chave]
+        return entrada['ok'] and time.time() - entrada['ts'] < TTL_CACHE_TESTE_IA
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _registrar_teste_ia(chave):
+    """Grava o sucesso da geração de teste"""
+    try:
+        with open(ARQUIVO_CACHE_TESTE_IA, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache[chave] = {'ok': True, 'ts': time.time()}
+    try:
+        with open(ARQUIVO_CACHE_TESTE_IA, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
 def testar_ollama(config):
     """Testa conexão com Ollama"""
     try:
@@ -101,7 +197,7 @@ def testar_ollama(config):
         print(f"   Modelo: {modelo}")
         
         # Testa conexão
-        response = requests.get(f"{url}/api/tags", timeout=10)
+        response = _sessao_http().get(f"{url}/api/tags", timeout=10)
         
         if response.status_code == 200:
             modelos = response.json().get('models', [])
@@ -122,10 +218,16 @@ def testar_ollama(config):
                     print(f"      - {m.get('name')}")
                 return False
             
+            # Geração testada recentemente: /api/tags acima já confirmou o servidor
+            chave = _chave_teste_ia('ollama', modelo, url)
+            if _teste_ia_recente(chave):
+                print(f"   {verde('✅ Ollama funcionando corretamente (geração testada na última hora)')}")
+                return True
+            
             # Testa geração
             print("\n   Testando geração de texto...")
             
-            test_response = requests.post(
+            test_response = _sessao_http().post(
                 f"{url}/api/generate",
                 json={
                     "model": modelo,
@@ -137,6 +239,7 @@ def testar_ollama(config):
             )
             
             if test_response.status_code == 200:
+                _registrar_teste_ia(chave)
                 print(f"   {verde('✅ Ollama funcionando corretamente')}")
                 return True
             else:
@@ -159,8 +262,6 @@ def testar_ollama(config):
 def testar_gemini(config):
     """Testa conexão com Gemini API"""
     try:
-        import requests
-        
         api_key = config.get('api_key', '')
         modelo = config.get('modelo', 'gemini-3-flash-preview')
         
@@ -175,19 +276,31 @@ def testar_gemini(config):
         # Testa conexão
         print("\n   Testando conexão com Gemini...")
         
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{modelo}:generateContent?key={api_key}"
+        chave = _chave_teste_ia('gemini', modelo, api_key)
+        recente = _teste_ia_recente(chave)
         
-        response = requests.post(
-            url,
-            json={
-                "contents": [{"parts": [{"text": "Responda apenas: OK"}]}],
-                "generationConfig": {"temperature": 0.1, "maxOutputTokens": 10}
-            },
-            timeout=15
-        )
+        if recente:
+            # Geração testada recentemente: só confirma chave e modelo (sem gerar)
+            url = f"https://generativelanguage.googleapis.com/v1beta/models/{modelo}?key={api_key}"
+            response = _sessao_http().get(url, timeout=15)
+        else:
+            url = f"https://generativelanguage.googleapis.com/v1beta/models/{modelo}:generateContent?key={api_key}"
+            
+            response = _sessao_http().post(
+                url,
+                json={
+                    "contents": [{"parts": [{"text": "Responda apenas: OK"}]}],
+                    "generationConfig": {"temperature": 0.1, "maxOutputTokens": 10}
+                },
+                timeout=15
+            )
         
         if response.status_code == 200:
-            print(f"   {verde('✅ Gemini funcionando corretamente')}")
+            if recente:
+                print(f"   {verde('✅ Gemini funcionando corretamente (geração testada na última hora)')}")
+            else:
+                _registrar_teste_ia(chave)
+                print(f"   {verde('✅ Gemini funcionando corretamente')}")
             return True
         elif response.status_code == 400:
             error = response.json().get('error', {}).get('message', 'Erro desconhecido')
@@ -209,6 +322,13 @@ def testar_gemini(config):
         return False
 
 
+def _resultado_batch(entrada):
+    """Converte um item da resposta de /batch do Trello em (status, nome)"""
+    if '200' in entrada:
+        return 200, entrada['200'].get('name', 'Sem nome')
+    return entrada.get('statusCode', '?'), None
+
+
 def testar_trello(config):
     """Testa conexão com Trello"""
     print(f"\n{azul('=' * 60)}")
@@ -216,8 +336,6 @@ def testar_trello(config):
     print(azul('=' * 60))
     
     try:
-        import requests
-        
         api_key_preview = config['api_key'][:10] + '...' if len(config['api_key']) > 10 else config['api_key']
         print(f"\n   API Key: {api_key_preview}")
         print(f"   Board ID: {config.get('board_id', 'N/A')}")
@@ -226,34 +344,37 @@ def testar_trello(config):
         base_url = "https://api.trello.com/1"
         params = {'key': config['api_key'], 'token': config['token']}
         
+        # Board e lista numa única requisição (/batch devolve uma resposta por URL)
+        urls = [f"/lists/{config['lista_id']}?fields=name"]
         if config.get('board_id'):
-            response = requests.get(
-                f"{base_url}/boards/{config['board_id']}",
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                board = response.json()
-                board_name = board.get('name', 'Sem nome')
-                print(f"   {verde('✅ Board encontrado: ' + board_name)}")
-            else:
-                print(f"   {vermelho('❌ Board não encontrado: ' + str(response.status_code))}")
-                return False
+            urls.insert(0, f"/boards/{config['board_id']}?fields=name")
         
-        response = requests.get(
-            f"{base_url}/lists/{config['lista_id']}",
-            params=params,
+        response = _sessao_http().get(
+            f"{base_url}/batch",
+            params=dict(params, urls=','.join(urls)),
             timeout=10
         )
         
-        if response.status_code == 200:
-            lista = response.json()
-            lista_name = lista.get('name', 'Sem nome')
+        if response.status_code != 200:
+            print(f"   {vermelho('❌ Erro ao consultar o Trello: ' + str(response.status_code))}")
+            return False
+        
+        resultados = [_resultado_batch(entrada) for entrada in response.json()]
+        
+        if config.get('board_id'):
+            status, board_name = resultados.pop(0)
+            if status == 200:
+                print(f"   {verde('✅ Board encontrado: ' + board_name)}")
+            else:
+                print(f"   {vermelho('❌ Board não encontrado: ' + str(status))}")
+                return False
+        
+        status, lista_name = resultados[0]
+        if status == 200:
             print(f"   {verde('✅ Lista encontrada: ' + lista_name)}")
             return True
         else:
-            print(f"   {vermelho('❌ Lista não encontrada: ' + str(response.status_code))}")
+            print(f"   {vermelho('❌ Lista não encontrada: ' + str(status))}")
             return False
             
     except Exception as e:
@@ -272,11 +393,9 @@ def testar_telegram(config):
         return True
     
     try:
-        import requests
-        
         print(f"\n   Chat ID: {config['chat_id']}")
         
-        response = requests.get(
+        response = _sessao_http().get(
             f"https://api.telegram.org/bot{config['token']}/getMe",
             timeout=10
         )
@@ -289,7 +408,7 @@ def testar_telegram(config):
             enviar = input("\n   Enviar mensagem de teste? (s/N): ").strip().lower()
             
             if enviar == 's':
-                msg_response = requests.post(
+                msg_response = _sessao_http().post(
                     f"https://api.telegram.org/bot{config['token']}/sendMessage",
                     data={
                         'chat_id': config['chat_id'],
@@ -328,12 +447,8 @@ def testar_lista_especial(config):
         return True
     
     try:
-        nomes = []
-        with open(arquivo, 'r', encoding='utf-8') as f:
-            for linha in f:
-                nome = linha.strip()
-                if nome and not nome.startswith('#'):
-                    nomes.append(nome)
+        linhas = Path(arquivo).read_text(encoding='utf-8').splitlines()
+        nomes = [nome for nome in map(str.strip, linhas) if nome and not nome.startswith('#')]
         
         print(f"   {verde('✅ Lista carregada: ' + str(len(nomes)) + ' nomes')}")
         
@@ -352,8 +467,26 @@ def testar_lista_especial(config):
         return False
 
 
+# Componentes testados (chaves aceitas em --somente=)
+COMPONENTES = {
+    'email': '📧 Email/Gmail',
+    'ia': '🧠 IA',
+    'trello': '📋 Trello',
+    'telegram': '📱 Telegram',
+    'lista_especial': '📋 Lista Especial'
+}
+
+
 def main():
     """Função principal de teste"""
+    saida = SaidaPorThread(sys.stdout)
+    sys.stdout = saida
+    
+    # Mostra as mensagens do EmailProcessor (logger 'bot.email') durante os testes
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    # Retentativas da sessão HTTP não precisam aparecer (o teste mostra o resultado final)
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+    
     print("\n" + "=" * 60)
     print("🧪 TESTE DE CONFIGURAÇÃO - Bot de Publicações (v3.0)")
     print("=" * 60)
@@ -367,14 +500,51 @@ def main():
     with open('config.json', 'r', encoding='utf-8') as f:
         config = json.load(f)
     
+    completo = '--completo' in sys.argv[1:]
+    
+    # --somente=trello,ia testa só esses componentes (os módulos dos demais nem são importados)
+    selecionados = set(COMPONENTES)
+    for arg in sys.argv[1:]:
+        if arg.startswith('--somente='):
+            selecionados = {nome.strip() for nome in arg.split('=', 1)[1].split(',') if nome.strip()}
+            desconhecidos = selecionados - set(COMPONENTES)
+            if desconhecidos or not selecionados:
+                if desconhecidos:
+                    print(f"\n{vermelho('❌ Componente(s) desconhecido(s) em --somente: ' + ', '.join(sorted(desconhecidos)))}")
+                else:
+                    print(f"\n{vermelho('❌ Nenhum componente informado em --somente')}")
+                print(f"Componentes válidos: {', '.join(COMPONENTES)}")
+                input("\nPressione ENTER para sair...")
+                sys.exit(1)
+    
     resultados = {}
     
-    # Testa cada componente
-    resultados['email'] = testar_email(config['email'])
-    resultados['ia'] = testar_ia(config.get('ia', {'provedor': 'ollama', 'ollama': config.get('ollama', {})}))
-    resultados['trello'] = testar_trello(config['trello'])
-    resultados['telegram'] = testar_telegram(config['telegram'])
-    resultados['lista_especial'] = testar_lista_especial(config.get('lista_especial', {}))
+    # Email, IA e Trello rodam em paralelo (cada um só espera a própria rede);
+    # a saída de cada teste aparece inteira e na ordem de sempre
+    testes_rede = {
+        'email': (testar_email, config['email'], completo),
+        'ia': (testar_ia, config.get('ia', {'provedor': 'ollama', 'ollama': config.get('ollama', {})})),
+        'trello': (testar_trello, config['trello']),
+    }
+    testes_rede = {chave: teste for chave, teste in testes_rede.items() if chave in selecionados}
+    
+    with ThreadPoolExecutor(max_workers=max(len(testes_rede), 1)) as executor:
+        futuros = {
+            chave: executor.submit(saida.executar, *teste)
+            for chave, teste in testes_rede.items()
+        }
+        for chave, futuro in futuros.items():
+            resultados[chave], texto = futuro.result()
+            print(texto, end='')
+    
+    # Telegram pergunta se envia mensagem de teste (input): fica na thread principal
+    if 'telegram' in selecionados:
+        resultados['telegram'] = testar_telegram(config['telegram'])
+    if 'lista_especial' in selecionados:
+        resultados['lista_especial'] = testar_lista_especial(config.get('lista_especial', {}))
+    
+    if _sessao is not None:
+        _sessao.close()
     
     # Resumo
     print(f"\n{azul('=' * 60)}")
@@ -383,16 +553,12 @@ def main():
     
     provedor = config.get('ia', {}).get('provedor', 'ollama').upper()
     
-    componentes = {
-        'email': '📧 Email/Gmail',
-        'ia': f'🧠 IA ({provedor})',
-        'trello': '📋 Trello',
-        'telegram': '📱 Telegram',
-        'lista_especial': '📋 Lista Especial'
-    }
+    componentes = dict(COMPONENTES, ia=f'🧠 IA ({provedor})')
     
     todos_ok = True
     for key, nome in componentes.items():
+        if key not in selecionados:
+            continue
         if resultados.get(key):
             print(f"   {verde('✅')} {nome}")
         else:
@@ -4,26 +4,119 @@ Cria cards automaticamente com as informações processadas
 Versão Opus - Com PF no título e limpeza de HTML
 """
 
-import requests
 import json
+import os
 import re
+import threading
+import time
 import html as html_module
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from sessao_http import criar_sessao
+
+
+# Limpeza do HTML da descrição (compiladas uma vez)
+# Uma única varredura: <br> e </div> viram quebra, </p> parágrafo, demais tags espaço
+_RE_HTML = re.compile(
+    r'<(?:(?P<br>\s*br\s*/?\s*)|/\s*(?:(?P<p>p)|(?P<div>div))\s*|[^>]+)>',
+    re.IGNORECASE
+)
+_SUBSTITUICAO_TAG = {'br': '\n', 'p': '\n\n', 'div': '\n'}
+_RE_WS = re.compile(r'[ \t]+')
+_RE_NL = re.compile(r'\n\s*\n\s*\n+')
+_RE_CTRL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _substituir_tag(match):
+    """Texto que substitui a tag encontrada por _RE_HTML"""
+    return _SUBSTITUICAO_TAG.get(match.lastgroup, ' ')
+
+
+# Limite seguro do título: 120 caracteres total para boa visualização
+LIMITE_TITULO = 120
+_ESPACO_TITULO = LIMITE_TITULO - 6  # 6 = " - " + " - "
+
+
+def _truncar(texto, tamanho):
+    """Corta o texto em 'tamanho' caracteres (terminando em '..')"""
+    return texto if len(texto) <= tamanho else texto[:tamanho - 2] + '..'
+
+
+# Validade do cache local das etiquetas (segundos)
+TTL_CACHE_ETIQUETAS = 24 * 60 * 60
+
+# Checklist adicionada a cada card
+NOME_CHECKLIST = 'Ações Necessárias'
+ITENS_CHECKLIST = [
+    '☐ Revisar prazo calculado',
+    '☐ Conferir dados extraídos',
+    '☐ Verificar texto integral',
+    '☐ Preparar providências',
+    '☐ Mudar para 🟢 REVISADO'
+]
+
+# Espera (segundos) antes de tentar criar de novo a checklist modelo após uma falha
+ESPERA_RETENTAR_MODELO = 60 * 60
+
 
 class TrelloManager:
-    def __init__(self, config):
-        """Inicializa gerenciador do Trello"""
+    def __init__(self, config, session=None):
+        """Inicializa gerenciador do Trello (session: requests.Session compartilhada)"""
         self.api_key = config['api_key']
         self.token = config['token']
         self.board_id = config.get('board_id')
         self.lista_id = config['lista_id']
         
         self.base_url = "https://api.trello.com/1"
+        # Só fecha em close() a sessão criada aqui (a compartilhada é do chamador)
+        self._sessao_propria = session is None
+        self.session = session or criar_sessao(tentativas=2)
+        
+        # Credenciais montadas uma vez; cada chamada só acrescenta os próprios campos
+        # (não usa session.params porque a sessão pode ser compartilhada)
+        self._auth = {'key': self.api_key, 'token': self.token}
+        
+        # URLs fixas montadas uma vez
+        self._url_cards = f"{self.base_url}/cards"
+        self._url_checklists = f"{self.base_url}/checklists"
+        self._url_labels = f"{self.base_url}/boards/{self.board_id}/labels"
+        
+        # Etiquetas por board mudam pouco: ficam em cache local por um dia
+        self.arquivo_cache_etiquetas = f".trello_labels_{self.board_id}.json"
+        
+        # Checklists criadas em segundo plano (o card já volta para o chamador)
+        self._executor_checklists = ThreadPoolExecutor(max_workers=4)
+        self._checklists_pendentes = []
+        
+        # Checklist modelo (card arquivado) copiada para cada card novo
+        self.arquivo_checklist_modelo = f".trello_checklist_{self.board_id or self.lista_id}.json"
+        self._id_checklist_modelo = None
+        self._retentar_modelo_em = 0
+        self._lock_modelo = threading.Lock()
         
         # IDs das etiquetas (serão criadas se não existirem)
         self.etiquetas = {}
-        self._setup_etiquetas()
+        self._etiquetas_do_cache = self._carregar_cache_etiquetas()
+        if not self._etiquetas_do_cache:
+            self._setup_etiquetas()
+    
+    def _params(self, **campos):
+        """Credenciais + campos da chamada"""
+        return {**self._auth, **campos}
+    
+    def aguardar_checklists(self):
+        """Espera as checklists em criação (chamar antes de encerrar o ciclo)"""
+        pendentes, self._checklists_pendentes = self._checklists_pendentes, []
+        for futuro in pendentes:
+            futuro.result()
+    
+    def close(self):
+        """Termina as checklists pendentes e fecha as conexões HTTP (se a sessão não for compartilhada)"""
+        self.aguardar_checklists()
+        self._executor_checklists.shutdown()
+        if self._sessao_propria:
+            self.session.close()
     
     def _setup_etiquetas(self):
         """Cria ou busca etiquetas padrão"""
@@ -36,22 +129,33 @@ class TrelloManager:
         
         try:
             # Busca etiquetas existentes
-            url = f"{self.base_url}/boards/{self.board_id}/labels"
-            params = {'key': self.api_key, 'token': self.token}
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(self._url_labels, params=self._auth, timeout=10)
             
             if response.status_code == 200:
                 labels_existentes = response.json()
                 
-                # Mapeia etiquetas existentes
+                # Mapeia etiquetas existentes (nome exato primeiro)
+                variacoes = {
+                    nome.upper().strip(): key
+                    for key, config in etiquetas_padrao.items()
+                    for nome in config['nomes']
+                }
+                sem_correspondencia = []
                 for label in labels_existentes:
                     label_name = label['name'].upper().strip()
-                    for key, config in etiquetas_padrao.items():
-                        for nome_variacao in config['nomes']:
-                            if nome_variacao.upper().strip() in label_name or label_name in nome_variacao.upper().strip():
-                                self.etiquetas[key] = label['id']
-                                print(f"   ✅ Etiqueta encontrada: {label['name']} → {key}")
-                                break
+                    key = variacoes.get(label_name)
+                    if key:
+                        self.etiquetas[key] = label['id']
+                        print(f"   ✅ Etiqueta encontrada: {label['name']} → {key}")
+                    elif label_name:
+                        sem_correspondencia.append((label, label_name))
+                
+                # Nomes parecidos (ex.: "A REVISAR - BOT") só para as que faltam
+                for label, label_name in sem_correspondencia:
+                    for nome_variacao, key in variacoes.items():
+                        if key not in self.etiquetas and (nome_variacao in label_name or label_name in nome_variacao):
+                            self.etiquetas[key] = label['id']
+                            print(f"   ✅ Etiqueta encontrada: {label['name']} → {key}")
                 
                 # Cria etiquetas faltantes
                 for key, config in etiquetas_padrao.items():
@@ -61,23 +165,50 @@ class TrelloManager:
                         if label_id:
                             self.etiquetas[key] = label_id
                             print(f"   ✅ Etiqueta criada: {config['nomes'][0]}")
+                
+                if len(self.etiquetas) == len(etiquetas_padrao):
+                    self._salvar_cache_etiquetas()
             else:
                 print(f"   ⚠️ Erro ao buscar etiquetas: {response.status_code}")
         except Exception as e:
             print(f"   ⚠️ Erro ao configurar etiquetas: {e}")
     
+    def _carregar_cache_etiquetas(self):
+        """Preenche self.etiquetas a partir do cache local (True se válido)"""
+        try:
+            with open(self.arquivo_cache_etiquetas, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if time.time() - cache['ts'] < TTL_CACHE_ETIQUETAS and cache['etiquetas']:
+                self.etiquetas = dict(cache['etiquetas'])
+                return True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return False
+    
+    def _salvar_cache_etiquetas(self):
+        """Grava o mapeamento das etiquetas do board"""
+        try:
+            with open(self.arquivo_cache_etiquetas, 'w', encoding='utf-8') as f:
+                json.dump({'ts': time.time(), 'etiquetas': self.etiquetas}, f)
+        except OSError as e:
+            print(f"   ⚠️ Erro ao gravar cache de etiquetas: {e}")
+    
+    def _invalidar_cache_etiquetas(self):
+        """Descarta o cache e busca as etiquetas de novo no board"""
+        try:
+            os.remove(self.arquivo_cache_etiquetas)
+        except OSError:
+            pass
+        self.etiquetas = {}
+        self._etiquetas_do_cache = False
+        self._setup_etiquetas()
+    
     def _criar_etiqueta(self, nome, cor):
         """Cria uma nova etiqueta no board"""
         try:
             url = f"{self.base_url}/labels"
-            params = {
-                'key': self.api_key,
-                'token': self.token,
-                'idBoard': self.board_id,
-                'name': nome,
-                'color': cor
-            }
-            response = requests.post(url, data=params, timeout=10)
+            params = self._params(idBoard=self.board_id, name=nome, color=cor)
+            response = self.session.post(url, data=params, timeout=10)
             
             if response.status_code == 200:
                 return response.json()['id']
@@ -94,43 +225,42 @@ class TrelloManager:
             # Monta descrição (com HTML limpo)
             descricao = self._montar_descricao(dados, email_data)
             
-            # Prepara etiquetas
-            etiquetas_card = []
-            
-            if 'a_revisar' in self.etiquetas:
-                etiquetas_card.append(self.etiquetas['a_revisar'])
-            
-            if dados.get('urgente') and 'urgente' in self.etiquetas:
-                etiquetas_card.append(self.etiquetas['urgente'])
-            
-            if dados.get('prazo_implicito') and 'prazo_implicito' in self.etiquetas:
-                etiquetas_card.append(self.etiquetas['prazo_implicito'])
-            
             # Converte data de entrega
             due_date = self._converter_data_prazo(dados.get('prazo_calculado'))
             
             # Cria card
-            url = f"{self.base_url}/cards"
-            params = {
-                'key': self.api_key,
-                'token': self.token,
-                'idList': self.lista_id,
-                'name': titulo,
-                'desc': descricao,
-                'due': due_date
-            }
+            url = self._url_cards
+            params = self._params(
+                idList=self.lista_id,
+                name=titulo,
+                desc=descricao,
+                due=due_date
+            )
             
             # Adiciona etiquetas se houver
+            etiquetas_card = self._etiquetas_card(dados)
             if etiquetas_card:
                 params['idLabels'] = ','.join(etiquetas_card)
             
-            response = requests.post(url, data=params, timeout=15)
+            response = self.session.post(url, data=params, timeout=15)
+            
+            # Etiqueta do cache apagada no board (idLabels inválido): atualiza e tenta de novo
+            if response.status_code == 400 and self._etiquetas_do_cache and etiquetas_card:
+                print("   ⚠️ Card recusado com etiquetas do cache, buscando etiquetas no board")
+                self._invalidar_cache_etiquetas()
+                params.pop('idLabels', None)
+                etiquetas_card = self._etiquetas_card(dados)
+                if etiquetas_card:
+                    params['idLabels'] = ','.join(etiquetas_card)
+                response = self.session.post(url, data=params, timeout=15)
             
             if response.status_code == 200:
                 card_data = response.json()
                 
-                # Cria checklist
-                self._criar_checklist(card_data['id'])
+                # Cria checklist em segundo plano (próximo card não espera por ela)
+                self._checklists_pendentes.append(
+                    self._executor_checklists.submit(self._criar_checklist, card_data['id'])
+                )
                 
                 return {
                     'id': card_data['id'],
@@ -148,6 +278,21 @@ class TrelloManager:
             traceback.print_exc()
             return None
     
+    def _etiquetas_card(self, dados):
+        """IDs das etiquetas que o card deve receber"""
+        etiquetas_card = []
+        
+        if 'a_revisar' in self.etiquetas:
+            etiquetas_card.append(self.etiquetas['a_revisar'])
+        
+        if dados.get('urgente') and 'urgente' in self.etiquetas:
+            etiquetas_card.append(self.etiquetas['urgente'])
+        
+        if dados.get('prazo_implicito') and 'prazo_implicito' in self.etiquetas:
+            etiquetas_card.append(self.etiquetas['prazo_implicito'])
+        
+        return etiquetas_card
+    
     def _montar_titulo(self, dados):
         """
         Monta título do card com formato:
@@ -165,9 +310,7 @@ class TrelloManager:
         parte_fixa = f"{processo} (PF: {prazo})"
         
         # Calcula espaço restante para cliente e tipo
-        # Limite seguro: 120 caracteres total para boa visualização
-        LIMITE_TOTAL = 120
-        espaco_restante = LIMITE_TOTAL - len(parte_fixa) - 6  # 6 = " - " + " - "
+        espaco_restante = _ESPACO_TITULO - len(parte_fixa)
         
         if espaco_restante > 20:
             # Divide espaço entre cliente e tipo
@@ -175,13 +318,7 @@ class TrelloManager:
             espaco_tipo = espaco_restante - espaco_cliente
             
             # Trunca se necessário
-            if len(cliente) > espaco_cliente:
-                cliente = cliente[:espaco_cliente-2] + '..'
-            
-            if len(tipo) > espaco_tipo:
-                tipo = tipo[:espaco_tipo-2] + '..'
-            
-            return f"{parte_fixa} - {cliente} - {tipo.upper()}"
+            return f"{parte_fixa} - {_truncar(cliente, espaco_cliente)} - {_truncar(tipo, espaco_tipo).upper()}"
         else:
             # Sem espaço: só processo e prazo
             return parte_fixa
@@ -191,23 +328,20 @@ class TrelloManager:
         if not texto:
             return "Corpo não disponível"
         
-        # Desescapa entidades HTML
-        texto = html_module.unescape(texto)
+        # Desescapa entidades HTML (corpo em texto puro pula as duas etapas)
+        if '&' in texto:
+            texto = html_module.unescape(texto)
         
-        # Converte quebras HTML para quebras normais
-        texto = re.sub(r'<\s*br\s*/?\s*>', '\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*p\s*>', '\n\n', texto, flags=re.IGNORECASE)
-        texto = re.sub(r'</\s*div\s*>', '\n', texto, flags=re.IGNORECASE)
-        
-        # Remove todas as tags HTML
-        texto = re.sub(r'<[^>]+>', ' ', texto)
+        # Converte quebras HTML para quebras normais e remove as demais tags
+        if '<' in texto:
+            texto = _RE_HTML.sub(_substituir_tag, texto)
         
         # Limpa espaços extras
-        texto = re.sub(r'[ \t]+', ' ', texto)
-        texto = re.sub(r'\n\s*\n\s*\n+', '\n\n', texto)
+        texto = _RE_WS.sub(' ', texto)
+        texto = _RE_NL.sub('\n\n', texto)
         
         # Remove caracteres de controle estranhos
-        texto = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', texto)
+        texto = _RE_CTRL.sub('', texto)
         
         return texto.strip()
     
@@ -226,18 +360,18 @@ class TrelloManager:
         if texto_truncado:
             texto_publicacao = texto_publicacao[:MAX_TEXTO]
         
-        # Monta descrição
-        descricao = f"""{'═'*50}
+        # Monta descrição (partes unidas no final)
+        partes = [f"""{'═'*50}
 📄 TEXTO DA PUBLICAÇÃO
 {'═'*50}
 
 {texto_publicacao}
 
-"""
+"""]
         if texto_truncado:
-            descricao += f"... (Texto truncado - total: {len(email_data.get('corpo', ''))} caracteres)\n\n"
+            partes.append(f"... (Texto truncado - total: {len(email_data.get('corpo', ''))} caracteres)\n\n")
         
-        descricao += f"""{'═'*50}
+        partes.append(f"""{'═'*50}
 🤖 RESUMO AUTOMÁTICO (CONFERIR!)
 ⚠️ CONFIANÇA: {nivel_confianca} ({int(confianca*100)}%)
 {'═'*50}
@@ -251,38 +385,38 @@ class TrelloManager:
 • Vara: {dados.get('vara') or 'N/A'}
 
 📅 PRAZO:
-"""
+""")
         
         # Adiciona informações de prazo
         if dados.get('prazo_calculado'):
-            descricao += f"• Data limite: {dados['prazo_calculado']}\n"
+            partes.append(f"• Data limite: {dados['prazo_calculado']}\n")
         
         if dados.get('prazo_mencionado'):
-            descricao += f"• Prazo mencionado: {dados['prazo_mencionado']}\n"
+            partes.append(f"• Prazo mencionado: {dados['prazo_mencionado']}\n")
         elif dados.get('prazo_implicito'):
-            descricao += "• ⚠️ Prazo não especificado (aplicado 5 dias úteis - CPC)\n"
+            partes.append("• ⚠️ Prazo não especificado (aplicado 5 dias úteis - CPC)\n")
         
         # Adiciona resumo em tópicos
         if dados.get('resumo_topicos'):
-            descricao += f"\n📋 DETERMINAÇÕES:\n\n"
+            partes.append(f"\n📋 DETERMINAÇÕES:\n\n")
             for topico in dados['resumo_topicos'][:5]:
                 topico_limpo = str(topico)[:200]
-                descricao += f"• {topico_limpo}\n"
+                partes.append(f"• {topico_limpo}\n")
         
         # Adiciona observações
         if dados.get('observacoes'):
             obs = str(dados['observacoes'])[:300]
-            descricao += f"\n⚠️ OBSERVAÇÕES:\n{obs}\n"
+            partes.append(f"\n⚠️ OBSERVAÇÕES:\n{obs}\n")
         
         # Avisos
-        descricao += f"""
+        partes.append(f"""
 {'═'*50}
 ⚠️ ATENÇÃO
 {'═'*50}
-"""
+""")
         
         if dados.get('prazo_implicito'):
-            descricao += """
+            partes.append("""
 🔴 PRAZO NÃO ESPECIFICADO NA PUBLICAÇÃO
 
 Prazo calculado: 5 dias úteis (regra geral CPC art. 231)
@@ -291,20 +425,21 @@ Revisar:
 - Confirmar se aplica prazo geral
 - Verificar caso específico
 - Validar dias úteis vs corridos
-"""
+""")
         
         if dados.get('urgente'):
-            descricao += "\n⚡ URGENTE! Publicação contém menção a urgência.\n"
+            partes.append("\n⚡ URGENTE! Publicação contém menção a urgência.\n")
         
-        descricao += f"""
+        partes.append(f"""
 {'═'*50}
 
 ⚠️ Resumo gerado por IA - SEMPRE conferir texto original!
 
 🤖 Processado: {datetime.now().strftime('%d/%m/%Y às %H:%M')}
-"""
+""")
         
         # Garante limite total
+        descricao = ''.join(partes)
         if len(descricao) > 15000:
             descricao = descricao[:15000] + "\n\n... (Descrição truncada)"
         
@@ -327,42 +462,110 @@ Revisar:
         return None
     
     def _criar_checklist(self, card_id):
-        """Cria checklist no card"""
+        """Cria checklist no card (cópia da checklist modelo, em uma única chamada)"""
         try:
-            url = f"{self.base_url}/checklists"
-            params = {
-                'key': self.api_key,
-                'token': self.token,
-                'idCard': card_id,
-                'name': 'Ações Necessárias'
-            }
-            response = requests.post(url, data=params, timeout=10)
-            
-            if response.status_code == 200:
-                checklist_id = response.json()['id']
-                
-                itens = [
-                    '☐ Revisar prazo calculado',
-                    '☐ Conferir dados extraídos',
-                    '☐ Verificar texto integral',
-                    '☐ Preparar providências',
-                    '☐ Mudar para 🟢 REVISADO'
-                ]
+            modelo = self._checklist_modelo()
+            if modelo:
+                url = self._url_checklists
+                params = self._params(idCard=card_id, name=NOME_CHECKLIST, idChecklistSource=modelo)
+                response = self.session.post(url, data=params, timeout=10)
+                if response.status_code == 200:
+                    return
                 
-                for item in itens:
-                    self._adicionar_item_checklist(checklist_id, item)
+                if response.status_code in (400, 404):
+                    # Modelo apagado/inválido no Trello: recria no próximo card
+                    print(f"⚠️ Checklist modelo indisponível ({response.status_code}), criando itens no card")
+                    self._descartar_checklist_modelo()
+                else:
+                    # Falha transitória (429/5xx): mantém o modelo
+                    print(f"⚠️ Erro ao copiar checklist modelo ({response.status_code}), criando itens no card")
+            
+            self._montar_checklist(card_id)
         except Exception as e:
             print(f"⚠️ Erro ao criar checklist: {e}")
     
-    def _adicionar_item_checklist(self, checklist_id, nome):
+    def _montar_checklist(self, card_id):
+        """Cria a checklist item a item; retorna o ID dela (ou None)"""
+        url = self._url_checklists
+        params = self._params(idCard=card_id, name=NOME_CHECKLIST)
+        response = self.session.post(url, data=params, timeout=10)
+        
+        if response.status_code != 200:
+            return None
+        
+        checklist_id = response.json()['id']
+        
+        # Itens criados em paralelo; 'pos' explícito mantém a ordem na checklist
+        with ThreadPoolExecutor(max_workers=len(ITENS_CHECKLIST)) as executor:
+            for posicao, item in enumerate(ITENS_CHECKLIST, 1):
+                executor.submit(self._adicionar_item_checklist, checklist_id, item, posicao)
+        
+        return checklist_id
+    
+    def _checklist_modelo(self):
+        """ID da checklist modelo (lida do arquivo local ou criada na primeira vez)"""
+        with self._lock_modelo:
+            if self._id_checklist_modelo is None and time.time() >= self._retentar_modelo_em:
+                self._id_checklist_modelo = (
+                    self._carregar_checklist_modelo() or self._criar_checklist_modelo()
+                )
+                if self._id_checklist_modelo is None:
+                    # Não foi possível criar: só tenta de novo depois de um tempo
+                    self._retentar_modelo_em = time.time() + ESPERA_RETENTAR_MODELO
+            return self._id_checklist_modelo
+    
+    def _carregar_checklist_modelo(self):
+        """Lê o modelo salvo (descarta se os itens da checklist mudaram)"""
+        try:
+            with open(self.arquivo_checklist_modelo, 'r', encoding='utf-8') as f:
+                salvo = json.load(f)
+            if salvo.get('itens') == ITENS_CHECKLIST:
+                return salvo['checklist']
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+    
+    def _criar_checklist_modelo(self):
+        """Cria um card arquivado com a checklist modelo e salva os IDs"""
+        try:
+            url = self._url_cards
+            params = self._params(idList=self.lista_id, name='Modelo da checklist do bot (não apagar)')
+            response = self.session.post(url, data=params, timeout=15)
+            if response.status_code != 200:
+                return None
+            card_id = response.json()['id']
+            
+            checklist_id = self._montar_checklist(card_id)
+            if not checklist_id:
+                # Não deixa o card do modelo incompleto na lista
+                self.session.delete(f"{self._url_cards}/{card_id}", params=self._auth, timeout=10)
+                return None
+            
+            # Arquivado: não aparece na lista, mas a checklist continua copiável
+            self.session.put(f"{self._url_cards}/{card_id}", data=self._params(closed='true'), timeout=10)
+            
+            with open(self.arquivo_checklist_modelo, 'w', encoding='utf-8') as f:
+                json.dump({'card': card_id, 'checklist': checklist_id, 'itens': ITENS_CHECKLIST}, f, ensure_ascii=False)
+            print(f"   ✅ Checklist modelo criada (card arquivado {card_id})")
+            return checklist_id
+        except Exception as e:
+            print(f"⚠️ Erro ao criar checklist modelo: {e}")
+            return None
+    
+    def _descartar_checklist_modelo(self):
+        """Esquece o modelo atual (será recriado no próximo card)"""
+        with self._lock_modelo:
+            self._id_checklist_modelo = None
+            try:
+                os.remove(self.arquivo_checklist_modelo)
+            except OSError:
+                pass
+    
+    def _adicionar_item_checklist(self, checklist_id, nome, posicao='bottom'):
         """Adiciona item na checklist"""
         try:
-            url = f"{self.base_url}/checklists/{checklist_id}/checkItems"
-            params = {
-                'key': self.api_key,
-                'token': self.token,
-                'name': nome
-            }
-            requests.post(url, data=params, timeout=5)
+            url = f"{self._url_checklists}/{checklist_id}/checkItems"
+            params = self._params(name=nome, pos=posicao)
+            self.session.post(url, data=params, timeout=5)
         except:
             pass